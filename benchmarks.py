@@ -0,0 +1,517 @@
+import argparse
+import asyncio
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+
+from create_synthetic_hemt import generate_rows
+
+# ============================================================
+# Config
+# ============================================================
+
+BENCH_RESULTS_DIR = "benchmark_results"
+
+SECTIONS = ("decompose", "embed", "search", "end_to_end")
+
+CORPUS_ROWS = 2_000
+REPEATS = 3              # best-of, per measurement
+
+EMBED_SAMPLE = 256       # texts for the (slow) one-at-a-time embedding loops
+SEARCH_POINTS = 5_000    # synthetic narratives/facts per collection
+SEARCH_QUERIES = 256
+END_TO_END_SAMPLE = 200  # messages pushed through check_health_claim
+
+# ============================================================
+# Helpers
+# ============================================================
+
+def best_of(fn, repeats: int = REPEATS):
+    """
+    Fastest wall time of `repeats` calls, in seconds.
+    """
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def rate(n_items: int, seconds: float):
+    return round(n_items / seconds, 2) if seconds else None
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+class StubLLM:
+    """
+    Stand-in for ollama.AsyncClient: fixed answer after `latency` seconds,
+    so end-to-end numbers measure the pipeline rather than Mistral.
+    """
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+
+    async def chat(self, model, messages, stream=False, **kwargs):
+        await asyncio.sleep(self.latency)
+        response = {
+            "message": {"content": "Verdict: UNVERIFIED\nExplanation: stub\nSources:"},
+            "prompt_eval_count": 0,
+            "eval_count": 0,
+            "done": True,
+        }
+        if not stream:
+            return response
+
+        async def chunks():
+            yield response
+
+        return chunks()
+
+# ============================================================
+# Sections
+# ============================================================
+
+def bench_decompose(texts, repeats: int):
+    from claim_decomposer import (
+        PARSE_CACHE_PATH,
+        PARSE_CACHE_SIZE,
+        configure_parse_cache,
+        extract_atomic_claims,
+        extract_atomic_claims_batch,
+        get_nlp,
+    )
+
+    nlp = get_nlp()
+    extract_atomic_claims(texts[0], nlp)  # warm-up
+
+    # Parser throughput: memoization off, or every repeat would be a cache hit
+    configure_parse_cache(max_entries=0)
+    try:
+        single = best_of(lambda: [extract_atomic_claims(t, nlp) for t in texts], repeats)
+        pipe = best_of(lambda: extract_atomic_claims_batch(texts, nlp=nlp), repeats)
+        pipe_2proc = best_of(
+            lambda: extract_atomic_claims_batch(texts, n_process=2, nlp=nlp), repeats
+        )
+    finally:
+        configure_parse_cache(PARSE_CACHE_SIZE, PARSE_CACHE_PATH)
+
+    # Memoized: first pass fills the cache, the timed passes hit it
+    configure_parse_cache(max_entries=max(len(texts), 1))
+    extract_atomic_claims_batch(texts, nlp=nlp)
+    cached = best_of(lambda: [extract_atomic_claims(t, nlp) for t in texts], repeats)
+    configure_parse_cache(PARSE_CACHE_SIZE, PARSE_CACHE_PATH)
+
+    return {
+        "texts": len(texts),
+        "single_texts_per_s": rate(len(texts), single),
+        "pipe_texts_per_s": rate(len(texts), pipe),
+        "pipe_2proc_texts_per_s": rate(len(texts), pipe_2proc),
+        "cached_texts_per_s": rate(len(texts), cached),
+    }
+
+
+def bench_embed(texts, repeats: int):
+    from sentence_transformers import SentenceTransformer
+
+    from medical_embeddings import embed_medical_batch
+    from verifacts_engine import EMBEDDING_MODEL_NAME
+
+    sample = texts[:EMBED_SAMPLE]
+    mpnet = SentenceTransformer(EMBEDDING_MODEL_NAME)
+    mpnet.encode(sample[:8])           # warm-up
+    embed_medical_batch(sample[:8])
+
+    return {
+        "texts": len(sample),
+        "mpnet_single_texts_per_s": rate(
+            len(sample), best_of(lambda: [mpnet.encode([t]) for t in sample], repeats)
+        ),
+        "mpnet_batched_texts_per_s": rate(
+            len(sample), best_of(lambda: mpnet.encode(sample, batch_size=32), repeats)
+        ),
+        "biobert_single_texts_per_s": rate(
+            len(sample), best_of(lambda: [embed_medical_batch([t]) for t in sample], repeats)
+        ),
+        "biobert_batched_texts_per_s": rate(
+            len(sample), best_of(lambda: embed_medical_batch(sample), repeats)
+        ),
+    }
+
+
+def bench_search(repeats: int, n_points: int = SEARCH_POINTS, n_queries: int = SEARCH_QUERIES):
+    """
+    Embedded (in-process) Qdrant with synthetic 768-d vectors: one
+    query_points call per claim vs the batched retrieve_evidence(), and
+    the same searches on local NumPy indexes (one GEMM per collection).
+    """
+    from qdrant_client import QdrantClient
+    from qdrant_client.models import PointStruct
+
+    from claim_context import DOMAIN_KEYWORDS
+    from evidence_retrieval import (
+        FACT_COLLECTION,
+        FACT_VECTOR_NAME,
+        MISINFO_COLLECTION,
+        MISINFO_VECTOR_NAME,
+        retrieve_evidence,
+    )
+    from local_index import LocalVectorIndex
+    from qdrant_setup import VECTOR_SIZE, provision_collection
+
+    rng = np.random.default_rng(0)
+    client = QdrantClient(":memory:")
+    domains = list(DOMAIN_KEYWORDS)
+
+    def unit(n):
+        vectors = rng.normal(size=(n, VECTOR_SIZE)).astype(np.float32)
+        return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+    for collection, vector_name, text_key in (
+        (MISINFO_COLLECTION, MISINFO_VECTOR_NAME, "claim_text"),
+        (FACT_COLLECTION, FACT_VECTOR_NAME, "fact_text"),
+    ):
+        provision_collection(client, collection, recreate=True)
+        client.upload_points(
+            collection_name=collection,
+            points=(
+                PointStruct(
+                    id=i,
+                    vector={vector_name: vector.tolist()},
+                    payload={
+                        text_key: f"synthetic {i}",
+                        "source": "synthetic",
+                        "verdict": "false",
+                        "language": "hi" if i % 4 == 0 else "en",
+                        "domain": domains[i % len(domains)],
+                    },
+                )
+                for i, vector in enumerate(unit(n_points))
+            ),
+            batch_size=256,
+            wait=True,
+        )
+
+    queries = unit(n_queries)
+    filters = [
+        {"language": "en", "domain": domains[i % len(domains)]} for i in range(n_queries)
+    ]
+
+    def per_claim():
+        for query in queries:
+            for collection, vector_name in (
+                (MISINFO_COLLECTION, MISINFO_VECTOR_NAME),
+                (FACT_COLLECTION, FACT_VECTOR_NAME),
+            ):
+                client.query_points(
+                    collection_name=collection, query=query.tolist(),
+                    using=vector_name, limit=2,
+                )
+
+    local_indexes = {}
+    for collection, vector_name in (
+        (MISINFO_COLLECTION, MISINFO_VECTOR_NAME),
+        (FACT_COLLECTION, FACT_VECTOR_NAME),
+    ):
+        local_indexes[collection] = LocalVectorIndex(
+            collection, vector_name, max_points=n_points
+        )
+        local_indexes[collection].refresh(client)
+
+    def local_per_claim():
+        for query in queries:
+            for index in local_indexes.values():
+                index.search([query], limit=2)
+
+    return {
+        "points_per_collection": n_points,
+        "claims": n_queries,
+        "per_claim_claims_per_s": rate(n_queries, best_of(per_claim, repeats)),
+        "batched_claims_per_s": rate(
+            n_queries, best_of(lambda: retrieve_evidence(client, queries), repeats)
+        ),
+        "batched_filtered_claims_per_s": rate(
+            n_queries,
+            best_of(lambda: retrieve_evidence(client, queries, filters=filters), repeats),
+        ),
+        "local_per_claim_claims_per_s": rate(n_queries, best_of(local_per_claim, repeats)),
+        "local_batched_claims_per_s": rate(
+            n_queries,
+            best_of(
+                lambda: retrieve_evidence(client, queries, local_indexes=local_indexes),
+                repeats,
+            ),
+        ),
+        "local_batched_filtered_claims_per_s": rate(
+            n_queries,
+            best_of(
+                lambda: retrieve_evidence(
+                    client, queries, filters=filters, local_indexes=local_indexes
+                ),
+                repeats,
+            ),
+        ),
+    }
+
+
+def bench_end_to_end(rows, llm_latency: float):
+    """
+    check_health_claim over corpus messages with a stubbed LLM, on an
+    in-process Qdrant seeded from the same corpus (fake rows as known
+    narratives, real rows as facts). Every run uses a fresh engine.
+    "Cold" runs have the verdict, semantic and parse caches switched off,
+    so every claim goes through retrieval (and the fast path or LLM);
+    "warm" repeats already answered messages with the caches on.
+    """
+    from qdrant_client import AsyncQdrantClient
+    from qdrant_client.models import Distance, PointStruct, VectorParams
+
+    from claim_decomposer import PARSE_CACHE_PATH, PARSE_CACHE_SIZE, configure_parse_cache
+    from embedding_store import EmbeddingStore
+    from evidence_retrieval import (
+        FACT_COLLECTION,
+        FACT_VECTOR_NAME,
+        MISINFO_COLLECTION,
+        MISINFO_VECTOR_NAME,
+    )
+    from result_cache import build_verdict_cache
+    from semantic_cache import SemanticCache
+    from verifacts_engine import EMBEDDING_MODEL_NAME, VerifactsEngine
+    from verifacts_pipeline import (
+        background_loop,
+        check_health_claim,
+        check_health_claims_batch_async,
+    )
+
+    def run(coro):
+        return asyncio.run_coroutine_threadsafe(coro, background_loop()).result()
+
+    store_root = tempfile.mkdtemp(prefix="verifacts_bench_")
+    sample = [row["text"] for row in rows[:END_TO_END_SAMPLE]]
+
+    # Seed vectors come from one shared encoder / spaCy load
+    seed_engine = VerifactsEngine(
+        embedding_store=EmbeddingStore(EMBEDDING_MODEL_NAME, root=store_root)
+    )
+    seeds = {
+        "fake": [row for row in rows if row["label"] == "fake"],
+        "real": [row for row in rows if row["label"] == "real"],
+    }
+    seed_vectors = {
+        label: seed_engine.embed([row["text"] for row in seed_rows])
+        for label, seed_rows in seeds.items()
+    }
+    dim = seed_engine.embedding_model.get_sentence_embedding_dimension()
+
+    async def seeded_client():
+        client = AsyncQdrantClient(":memory:")
+        for collection, vector_name, label in (
+            (MISINFO_COLLECTION, MISINFO_VECTOR_NAME, "fake"),
+            (FACT_COLLECTION, FACT_VECTOR_NAME, "real"),
+        ):
+            await client.create_collection(
+                collection,
+                vectors_config={vector_name: VectorParams(size=dim, distance=Distance.COSINE)},
+            )
+            await client.upsert(collection, [
+                PointStruct(
+                    id=i,
+                    vector={vector_name: vector.tolist()},
+                    payload={
+                        "claim_text": row["text"],
+                        "fact_text": row["text"],
+                        "verdict": "false",
+                        "source": row["source"],
+                        "language": row["language"],
+                        "domain": row["domain"],
+                    },
+                )
+                for i, (row, vector) in enumerate(zip(seeds[label], seed_vectors[label]))
+            ])
+        return client
+
+    def fresh_engine(caches: bool = True):
+        # Fresh caches; the embedding store is empty too, so the encoder runs
+        uncached = {}
+        if not caches:
+            uncached = {
+                "verdict_cache": build_verdict_cache(max_entries=0),
+                # No similarity reaches an infinite threshold: never a hit
+                "semantic_cache": SemanticCache(dim, capacity=1, threshold=float("inf")),
+            }
+
+        return VerifactsEngine(
+            nlp=seed_engine.nlp,
+            embedding_model=seed_engine.embedding_model,
+            async_client=run(seeded_client()),
+            llm_client=StubLLM(llm_latency),
+            embedding_store=EmbeddingStore(
+                EMBEDDING_MODEL_NAME, root=tempfile.mkdtemp(dir=store_root)
+            ),
+            **uncached,
+        )
+
+    configure_parse_cache(max_entries=0)
+    try:
+        engine = fresh_engine(caches=False)
+        start = time.perf_counter()
+        for text in sample:
+            check_health_claim(text, engine=engine)
+        cold = time.perf_counter() - start
+        cold_paths = engine.path_counter.counts()
+
+        engine = fresh_engine(caches=False)
+        start = time.perf_counter()
+        run(check_health_claims_batch_async(sample, engine=engine))
+        batched = time.perf_counter() - start
+    finally:
+        configure_parse_cache(PARSE_CACHE_SIZE, PARSE_CACHE_PATH)
+
+    engine = fresh_engine()
+    for text in sample:
+        check_health_claim(text, engine=engine)  # fills the caches
+
+    start = time.perf_counter()
+    for text in sample:
+        check_health_claim(text, engine=engine)
+    warm = time.perf_counter() - start
+
+    return {
+        "messages": len(sample),
+        "distinct_messages": len(set(sample)),
+        "llm_latency_ms": llm_latency * 1000,
+        "cold_messages_per_s": rate(len(sample), cold),
+        "warm_messages_per_s": rate(len(sample), warm),
+        "batched_cold_messages_per_s": rate(len(sample), batched),
+        "cold_paths": cold_paths,
+    }
+
+# ============================================================
+# Run + compare
+# ============================================================
+
+def run_benchmarks(
+    sections=SECTIONS,
+    rows: int = CORPUS_ROWS,
+    repeats: int = REPEATS,
+    search_points: int = SEARCH_POINTS,
+    llm_latency: float = 0.0,
+):
+    """
+    Run the selected sections on a synthetic corpus of `rows` messages.
+    A section that cannot run (e.g. a model is not installed) records its
+    error instead of aborting the suite.
+    """
+    corpus = generate_rows(rows)
+    texts = [row["text"] for row in corpus]
+
+    runners = {
+        "decompose": lambda: bench_decompose(texts, repeats),
+        "embed": lambda: bench_embed(texts, repeats),
+        "search": lambda: bench_search(repeats, n_points=search_points),
+        "end_to_end": lambda: bench_end_to_end(corpus, llm_latency),
+    }
+
+    results = {}
+    for section in sections:
+        print(f"[{section}] running...", file=sys.stderr, flush=True)
+        start = time.perf_counter()
+        try:
+            results[section] = runners[section]()
+        except Exception as exc:
+            results[section] = {"error": f"{type(exc).__name__}: {exc}"}
+        print(f"[{section}] {time.perf_counter() - start:.1f}s", file=sys.stderr, flush=True)
+
+    return {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "git_commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "corpus_rows": rows,
+            "repeats": repeats,
+        },
+        "results": results,
+    }
+
+
+def compare(baseline, current):
+    """
+    Lines of "section.metric: old -> new (+x%)" for numeric metrics in both runs.
+    """
+    lines = []
+    for section, metrics in current["results"].items():
+        old_metrics = baseline["results"].get(section, {})
+        for name, value in metrics.items():
+            old = old_metrics.get(name)
+            if not isinstance(value, (int, float)) or not isinstance(old, (int, float)):
+                continue
+            change = f"{(value - old) / old * 100:+.1f}%" if old else "n/a"
+            lines.append(f"{section}.{name}: {old} -> {value} ({change})")
+    return lines
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="VeriFacts performance benchmarks.")
+    parser.add_argument("--sections", nargs="+", choices=SECTIONS, default=list(SECTIONS))
+    parser.add_argument("--rows", type=int, default=CORPUS_ROWS,
+                        help="synthetic corpus size (see create_synthetic_hemt.py)")
+    parser.add_argument("--repeats", type=int, default=REPEATS)
+    parser.add_argument("--search-points", type=int, default=SEARCH_POINTS)
+    parser.add_argument("--llm-latency-ms", type=float, default=0.0,
+                        help="simulated latency of the stubbed LLM")
+    parser.add_argument("--output",
+                        help=f"result JSON (default: {BENCH_RESULTS_DIR}/<time>_<commit>.json)")
+    parser.add_argument("--compare", metavar="BASELINE_JSON",
+                        help="print changes against an earlier result file")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+
+    report = run_benchmarks(
+        sections=args.sections,
+        rows=args.rows,
+        repeats=args.repeats,
+        search_points=args.search_points,
+        llm_latency=args.llm_latency_ms / 1000,
+    )
+
+    output = args.output
+    if output is None:
+        os.makedirs(BENCH_RESULTS_DIR, exist_ok=True)
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        output = os.path.join(BENCH_RESULTS_DIR, f"{stamp}_{report['meta']['git_commit']}.json")
+
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+
+    print(json.dumps(report["results"], indent=2, ensure_ascii=False))
+    print(f"\nSaved {output}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+
+        print(f"\n=== vs {args.compare} ===\n")
+        for line in compare(baseline, report):
+            print(line)
@@ -0,0 +1,314 @@
+import asyncio
+import csv
+import json
+import os
+import sys
+import time
+from itertools import islice
+
+from claim_decomposer import extract_atomic_claims_batch
+from verifacts_engine import VerifactsEngine, get_engine
+from verifacts_pipeline import (
+    LLM_CONCURRENCY,
+    answer_claims_async,
+    background_loop,
+    no_claim_result,
+)
+
+# ============================================================
+# Offline bulk verification: JSONL / CSV archive -> JSONL results
+# ============================================================
+
+# Text column / key, tried in order when none is given
+TEXT_FIELDS = ("text", "body", "claim_text", "claim", "message")
+ID_FIELDS = ("id", "request_id", "message_id")
+
+# Records handed to nlp.pipe at a time. Every chunk starts a fresh pool of
+# NLP_PROCESSES workers (each loading the spaCy models), so keep it large.
+DECOMPOSE_CHUNK_RECORDS = 50_000
+NLP_PROCESSES = 2
+
+CLAIM_CHUNK = 256     # distinct claims embedded + searched together
+PIPELINE_DEPTH = 2    # claim chunks in flight (embed/search overlaps the LLM)
+
+PROGRESS_EVERY_SECONDS = 5
+
+# ============================================================
+# Input
+# ============================================================
+
+def _pick_field(record, field, candidates):
+    if field:
+        return field
+    return next((name for name in candidates if name in record), None)
+
+
+def read_records(path: str, text_field: str = None):
+    """
+    Stream (record_id, text) pairs from a .csv file (header row) or a JSONL
+    file (one object per line). Records without text are skipped.
+    """
+    with open(path, encoding="utf-8", newline="") as f:
+        if path.lower().endswith(".csv"):
+            rows = csv.DictReader(f)
+        else:
+            rows = (json.loads(line) for line in f if line.strip())
+
+        for number, record in enumerate(rows, start=1):
+            field = _pick_field(record, text_field, TEXT_FIELDS)
+            id_field = _pick_field(record, None, ID_FIELDS)
+
+            text = record.get(field) if field else None
+            if not isinstance(text, str) or not text.strip():
+                continue
+
+            yield (record[id_field] if id_field else number), text
+
+
+def read_written_ids(path: str):
+    """
+    Ids of the records already in an output file of a previous run.
+    A last line cut short by a crash is truncated away, so appending
+    continues on a clean line.
+    """
+    ids = set()
+    if not os.path.exists(path):
+        return ids
+
+    with open(path, "rb+") as f:
+        complete = 0
+        for line in f:
+            if not line.endswith(b"\n"):
+                break
+            try:
+                ids.add(_id_key(json.loads(line)["id"]))
+            except (ValueError, KeyError, TypeError):
+                break
+            complete += len(line)
+
+        f.truncate(complete)
+
+    return ids
+
+
+def _id_key(record_id):
+    # CSV ids are strings, JSONL ids may be numbers: compare their JSON form
+    return json.dumps(record_id, ensure_ascii=False)
+
+
+def _chunks(iterable, size: int):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+# ============================================================
+# Progress
+# ============================================================
+
+class Progress:
+    """
+    Rate-limited progress/throughput lines on stderr.
+    """
+
+    def __init__(self, stage: str, total: int = None):
+        self.stage = stage
+        self.total = total
+        self.done = 0
+        self.start = time.perf_counter()
+        self._last = self.start
+
+    def advance(self, n: int, force: bool = False):
+        self.done += n
+        now = time.perf_counter()
+
+        if force or now - self._last >= PROGRESS_EVERY_SECONDS:
+            self._last = now
+            elapsed = now - self.start
+            rate = self.done / elapsed if elapsed else 0.0
+            total = f"/{self.total}" if self.total is not None else ""
+            print(f"[{self.stage}] {self.done}{total} in {elapsed:.1f}s "
+                  f"({rate:.1f}/s)", file=sys.stderr, flush=True)
+
+# ============================================================
+# Bulk run
+# ============================================================
+
+async def bulk_verify_async(
+    input_path: str,
+    output_path: str,
+    text_field: str = None,
+    n_process: int = NLP_PROCESSES,
+    max_concurrency: int = LLM_CONCURRENCY,
+    engine: VerifactsEngine = None,
+    resume: bool = True,
+):
+    """
+    Verify every record of `input_path`, writing one JSON line per record
+    ({"id", "results"}) to `output_path` in input order.
+
+    With `resume`, records whose id is already in `output_path` (from an
+    interrupted run) are skipped and new lines are appended. A claim that
+    fails is written as {"claim", "error"} in its records' results, so one
+    bad claim does not stop the run.
+
+    1. Decompose all records (nlp.pipe over `n_process` processes) and
+       collect the distinct claims of the whole file
+    2. Answer distinct claims in chunks of CLAIM_CHUNK: batched embedding
+       and retrieval per chunk, PIPELINE_DEPTH chunks in flight, and at
+       most `max_concurrency` LLM calls across all of them
+    3. Write each record as soon as all of its claims are answered
+
+    Returns a summary dict.
+    """
+    engine = engine or get_engine()
+    start = time.perf_counter()
+    paths_before = engine.path_counter.counts()
+
+    written_ids = read_written_ids(output_path) if resume else set()
+    records = (
+        (record_id, text)
+        for record_id, text in read_records(input_path, text_field)
+        if _id_key(record_id) not in written_ids
+    )
+    if written_ids:
+        print(f"Resuming: {len(written_ids)} records already in {output_path}",
+              file=sys.stderr, flush=True)
+
+    # -----------------------------
+    # 1. Decompose + dedupe
+    # -----------------------------
+    record_ids = []
+    record_claims = []      # per record: indices into unique_claims
+    claim_index = {}
+    unique_claims = []
+    claim_uses = []         # per distinct claim: records (occurrences) still to write
+
+    progress = Progress("decompose records")
+
+    for chunk in _chunks(records, DECOMPOSE_CHUNK_RECORDS):
+        claims_per_text = await asyncio.to_thread(
+            extract_atomic_claims_batch,
+            [text for _, text in chunk],
+            n_process=n_process,
+            nlp=engine.nlp,
+        )
+
+        for (record_id, _), claims in zip(chunk, claims_per_text):
+            indices = []
+            for claim in claims:
+                if claim not in claim_index:
+                    claim_index[claim] = len(unique_claims)
+                    unique_claims.append(claim)
+                    claim_uses.append(0)
+                indices.append(claim_index[claim])
+                claim_uses[claim_index[claim]] += 1
+
+            record_ids.append(record_id)
+            record_claims.append(indices)
+
+        progress.advance(len(chunk))
+
+    progress.advance(0, force=True)
+    n_claims = sum(len(indices) for indices in record_claims)
+    print(f"{len(record_ids)} records, {n_claims} claims, "
+          f"{len(unique_claims)} distinct", file=sys.stderr, flush=True)
+
+    # -----------------------------
+    # 2. + 3. Answer + write
+    # -----------------------------
+    answers = {}  # distinct claim index -> result, dropped once its last record is written
+    written = 0
+    errors = 0
+
+    semaphore = asyncio.Semaphore(max_concurrency)
+    depth = asyncio.Semaphore(PIPELINE_DEPTH)
+    progress = Progress("answer claims", total=len(unique_claims))
+
+    with open(output_path, "a" if resume else "w", encoding="utf-8") as out:
+
+        def flush():
+            # Records are written in input order, as soon as they are complete
+            nonlocal written
+            while written < len(record_ids) and all(
+                i in answers for i in record_claims[written]
+            ):
+                indices = record_claims[written]
+                results = [answers[i] for i in indices] or no_claim_result()
+                out.write(json.dumps(
+                    {"id": record_ids[written], "results": results},
+                    ensure_ascii=False
+                ) + "\n")
+                written += 1
+
+                for i in indices:
+                    claim_uses[i] -= 1
+                    if claim_uses[i] == 0:
+                        del answers[i]
+            out.flush()
+
+        def error_result(claim, exc):
+            nonlocal errors
+            errors += 1
+            return {"claim": claim, "error": f"{type(exc).__name__}: {exc}"}
+
+        async def answer(offset: int):
+            try:
+                chunk = unique_claims[offset:offset + CLAIM_CHUNK]
+                try:
+                    results = await answer_claims_async(
+                        chunk, max_concurrency, engine, semaphore=semaphore,
+                        return_exceptions=True
+                    )
+                except Exception as exc:
+                    # Embedding / retrieval failed for the whole chunk
+                    results = [exc] * len(chunk)
+
+                for i, (claim, result) in enumerate(zip(chunk, results), start=offset):
+                    if isinstance(result, Exception):
+                        result = error_result(claim, result)
+                    answers[i] = result
+
+                progress.advance(len(results))
+                flush()
+            finally:
+                depth.release()
+
+        flush()  # records without claims at the head of the file
+
+        tasks = []
+        for offset in range(0, len(unique_claims), CLAIM_CHUNK):
+            await depth.acquire()
+            tasks.append(asyncio.create_task(answer(offset)))
+
+        await asyncio.gather(*tasks)
+        flush()
+
+    progress.advance(0, force=True)
+    elapsed = time.perf_counter() - start
+
+    return {
+        "records": len(record_ids),
+        "claims": n_claims,
+        "distinct_claims": len(unique_claims),
+        "errors": errors,
+        "skipped_written": len(written_ids),
+        "seconds": round(elapsed, 2),
+        "records_per_second": round(len(record_ids) / elapsed, 2) if elapsed else 0.0,
+        "paths": {
+            path: count - paths_before[path]
+            for path, count in engine.path_counter.counts().items()
+        },
+    }
+
+
+def bulk_verify(input_path: str, output_path: str, **kwargs):
+    """
+    Blocking wrapper around bulk_verify_async() (runs on the shared
+    pipeline loop, like check_health_claim()).
+    """
+    return asyncio.run_coroutine_threadsafe(
+        bulk_verify_async(input_path, output_path, **kwargs), background_loop()
+    ).result()
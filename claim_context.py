@@ -0,0 +1,80 @@
+import re
+
+# ============================================================
+# Cheap language + domain detection for atomic claims
+# (used to narrow Qdrant searches with payload filters)
+# ============================================================
+
+DEVANAGARI = re.compile(r"[\u0900-\u097F]")
+LATIN = re.compile(r"[A-Za-z\u00C0-\u024F]")
+OTHER_LETTER = re.compile(r"[^\W\d_A-Za-z\u00C0-\u024F\u0900-\u097F]")
+
+# Any other script (Tamil, Bengali, Urdu, ...): no parser, no filter
+UNDETERMINED = "und"
+
+# Languages the misinformation narratives are labelled with at ingestion;
+# claims in any other language are searched without a language filter
+FILTER_LANGUAGES = ("en", "hi")
+
+# Checked in order: "turmeric cures diabetes" is a nutrition claim,
+# matching how the narratives are labelled at ingestion time.
+DOMAIN_KEYWORDS = {
+    "vaccination": (
+        "vaccin", "vaxx", "jab", "immunis", "immuniz", "polio", "mmr",
+        "टीक", "वैक्सीन", "पोलियो",
+    ),
+    "nutrition": (
+        "turmeric", "garlic", "ginger", "diet", "food", "herb", "haldi",
+        "हल्दी", "लहसुन", "आहार", "खाना",
+    ),
+    "disease": (
+        "cancer", "diabetes", "tuberculosis", "malaria", "dengue", "covid",
+        "कैंसर", "मधुमेह", "बीमारी",
+    ),
+}
+
+
+def detect_language(text: str) -> str:
+    """
+    "hi" when the text is mostly Devanagari, "en" when mostly Latin
+    (or has no letters at all), otherwise UNDETERMINED.
+    """
+    devanagari = len(DEVANAGARI.findall(text))
+    latin = len(LATIN.findall(text))
+    other = len(OTHER_LETTER.findall(text))
+
+    if devanagari > max(latin, other):
+        return "hi"
+    if other > latin:
+        return UNDETERMINED
+    return "en"
+
+
+def detect_domain(text: str):
+    """
+    First domain whose keywords appear in the text, or None.
+    """
+    lowered = text.lower()
+
+    for domain, keywords in DOMAIN_KEYWORDS.items():
+        if any(keyword in lowered for keyword in keywords):
+            return domain
+
+    return None
+
+
+def claim_filters(claim: str):
+    """
+    Payload filter spec for one claim, e.g. {"language": "en", "domain": "vaccination"}.
+    """
+    filters = {}
+
+    language = detect_language(claim)
+    if language in FILTER_LANGUAGES:
+        filters["language"] = language
+
+    domain = detect_domain(claim)
+    if domain:
+        filters["domain"] = domain
+
+    return filters
@@ -1,10 +1,48 @@
-import spacy
+import hashlib
+import re
+import threading
+import unicodedata
+
+from claim_context import detect_language
+from result_cache import LRUCache, SQLiteCache, TieredCache
 
 # ============================================================
-# Load spaCy pretrained model
+# Load spaCy pretrained models (lazily, per language, on first use)
 # ============================================================
 
-nlp = spacy.load("en_core_web_sm")
+SPACY_MODEL = "en_core_web_sm"
+
+# Language (claim_context.detect_language) -> spaCy pipeline.
+# The claim rules in claims_from_doc() need a dependency parser; languages
+# without one here use the sentence-level fallback (sentence_claims()).
+LANGUAGE_MODELS = {
+    "en": SPACY_MODEL,
+}
+
+# Components whose output the algorithm never reads
+# (it only uses sentence boundaries, dependencies, POS tags and lemmas)
+UNUSED_COMPONENTS = ["ner"]
+
+_nlps = {}
+_nlp_lock = threading.Lock()
+
+
+def get_nlp(language: str = "en"):
+    """
+    Shared spaCy pipeline for `language`, loaded on first call
+    (thread-safe), or None when the language has no configured model.
+    """
+    model_name = LANGUAGE_MODELS.get(language)
+    if model_name is None:
+        return None
+
+    if language not in _nlps:
+        with _nlp_lock:
+            if language not in _nlps:
+                import spacy
+                _nlps[language] = spacy.load(model_name, exclude=UNUSED_COMPONENTS)
+
+    return _nlps[language]
 
 # Verbs that indicate reporting / framing, not factual claims
 REPORTING_VERBS = {
@@ -12,8 +50,198 @@ REPORTING_VERBS = {
     "suggest", "warn", "report"
 }
 
+# Sentences containing any of these (as substrings) are chain-message noise
+NOISE_MARKERS = (
+    "share", "forward", "send", "viral",
+    "शेयर", "फॉरवर्ड", "भेजें", "वायरल",
+)
+
+# Sentences starting with these are opinions
+OPINION_PREFIXES = ("i feel", "i think")
+
+# ============================================================
+# Rule-based pre-filter (runs before the parser)
+# ============================================================
+
+# Skip spaCy entirely for sentences the claim rules would drop anyway
+PREFILTER = True
+
+_NOISE_RE = re.compile("|".join(map(re.escape, NOISE_MARKERS)))
+_LETTER_RE = re.compile(r"[^\W\d_]")
+
+# Sentence boundaries: line breaks (forwards are often one claim per line),
+# whitespace after final punctuation, and runs of ! ? । with no space after
+# them. A bare "." only ends a sentence before a capital, so decimals and
+# URLs (2.5 mg, who.int) stay whole.
+_SENTENCE_SPLIT_RE = re.compile(
+    r"(\s*\n\s*|(?<=[.!?।])\s+|(?<=[!?।])(?=[^\s.!?।])|(?<=\.)(?=[A-Z]))"
+)
+
+
+def _sentences(text: str):
+    """
+    (sentence, separator before it) pairs; separators are "" or whitespace.
+    """
+    parts = _SENTENCE_SPLIT_RE.split(text.strip())
+    separators = [""] + parts[1::2]
+    return [
+        (sentence, separator)
+        for sentence, separator in zip(parts[::2], separators)
+        if sentence
+    ]
+
+
+def _is_noise(sentence: str) -> bool:
+    sentence = sentence.strip().lower()
+    return (
+        not _LETTER_RE.search(sentence)  # emoji / punctuation only: no verb
+        or _NOISE_RE.search(sentence) is not None
+        or sentence.startswith(OPINION_PREFIXES)
+    )
+
+
+def prefilter(text: str):
+    """
+    Text worth parsing, or None when no sentence can yield a claim.
+
+    Splits on line breaks and sentence-final punctuation (. ! ? and the
+    Devanagari danda) and drops sentences the claim rules in
+    claims_from_doc() reject. Returns `text` unchanged when nothing was
+    dropped, otherwise the remaining sentences joined by a line break
+    where one separated them and a space elsewhere.
+    """
+    sentences = _sentences(text)
+    kept = [(s, sep) for s, sep in sentences if not _is_noise(s)]
+
+    if not kept:
+        return None
+    if len(kept) == len(sentences):
+        return text
+
+    joined = kept[0][0]
+    for sentence, separator in kept[1:]:
+        joined += ("\n" if "\n" in separator else " ") + sentence
+    return joined
+
+
+# ============================================================
+# Parse-result cache (normalized text -> claim list)
+# ============================================================
+
+PARSE_CACHE_SIZE = 10_000  # in-process entries; 0 disables the cache
+PARSE_CACHE_PATH = None    # e.g. "parse_cache.sqlite3", shared by worker processes
+
+# Part of every cache key: bump when the claim rules or models change so
+# entries in a shared cache file stop being served
+DECOMPOSER_VERSION = "3"
+
+_parse_cache = None
+_parse_cache_ready = False
+_parse_cache_lock = threading.RLock()
+
+
+def normalize_text(text: str) -> str:
+    """
+    NFC-normalized text with runs of spaces/tabs collapsed and blank space
+    around line breaks removed (line breaks can end sentences, so they stay).
+    """
+    text = unicodedata.normalize("NFC", text)
+    text = re.sub(r"[^\S\n]+", " ", text)
+    text = re.sub(r" ?\n\s*", "\n", text)
+    return text.strip()
+
 
-def extract_atomic_claims(text: str):
+def pipeline_id(nlp=None) -> str:
+    """
+    Identity of an `nlp` override for cache keys: "" for the default
+    English pipeline, otherwise its name, version and components.
+    """
+    if nlp is None or nlp is _nlps.get("en"):
+        return ""
+
+    meta = getattr(nlp, "meta", None)
+    if not meta:
+        # Not a spaCy Language: only this object is known to parse alike
+        return f"{type(nlp).__name__}@{id(nlp)}"
+
+    components = ",".join(getattr(nlp, "pipe_names", ()))
+    return f"{meta.get('lang')}_{meta.get('name')}-{meta.get('version')}[{components}]"
+
+
+def parse_cache_key(normalized_text: str, nlp=None) -> str:
+    payload = f"{DECOMPOSER_VERSION}\0{pipeline_id(nlp)}\0{normalized_text}".encode("utf-8")
+    return hashlib.sha256(payload).hexdigest()
+
+
+def configure_parse_cache(max_entries: int = PARSE_CACHE_SIZE, sqlite_path: str = PARSE_CACHE_PATH):
+    """
+    (Re)build the shared parse cache. `max_entries=0` disables it;
+    `sqlite_path` adds a disk tier several processes can share.
+    """
+    global _parse_cache, _parse_cache_ready
+
+    with _parse_cache_lock:
+        if max_entries <= 0:
+            _parse_cache = None
+        else:
+            disk = SQLiteCache(sqlite_path) if sqlite_path else None
+            _parse_cache = TieredCache(LRUCache(max_entries), disk)
+        _parse_cache_ready = True
+
+    return _parse_cache
+
+
+def get_parse_cache():
+    """
+    The shared parse cache (built from the config on first use), or None.
+    """
+    if not _parse_cache_ready:
+        with _parse_cache_lock:
+            if not _parse_cache_ready:
+                configure_parse_cache()
+    return _parse_cache
+
+
+def parse_cache_stats():
+    cache = get_parse_cache()
+    return cache.stats() if cache is not None else None
+
+# ============================================================
+# Claim extraction
+# ============================================================
+
+def sentence_claims(text: str):
+    """
+    Sentence-level fallback for languages without a dependency parser:
+    every non-noise sentence (or line) is one claim (lowercased, whitespace
+    collapsed, final punctuation stripped), which is also how narratives
+    in those languages are stored for retrieval.
+    """
+    claims = []
+
+    for sentence, _ in _sentences(text):
+        if _is_noise(sentence):
+            continue
+
+        claim = " ".join(sentence.lower().split()).rstrip(".!?। ")
+        if claim:
+            claims.append(claim)
+
+    return list(dict.fromkeys(claims))
+
+
+def _route(text: str, nlp):
+    """
+    (language, pipeline) for a text; pipeline is None for the fallback.
+    `nlp`, when given, is used for English.
+    """
+    language = detect_language(text)
+    if language == "en" and nlp is not None:
+        return language, nlp
+    return language, get_nlp(language)
+
+
+def extract_atomic_claims(text: str, nlp=None):
     """
     Extract atomic factual claims using dependency parsing.
     Handles:
@@ -21,17 +249,125 @@ def extract_atomic_claims(text: str):
     - framing clauses
     - subject inheritance
     - biomedical term preservation (no lemmatization of objects)
+
+    The text is routed by script (claim_context.detect_language) to its
+    language's pipeline, or to sentence_claims() when LANGUAGE_MODELS has
+    none. `nlp` overrides the English pipeline (en_core_web_sm).
+
+    Results are memoized by normalized text and pipeline (see
+    get_parse_cache()), so a repeated message skips the parser entirely.
+    """
+    text = normalize_text(text)
+
+    cache = get_parse_cache()
+    if cache is None:
+        return _extract(text, nlp)
+
+    key = parse_cache_key(text, nlp)
+    claims = cache.get(key)
+    if claims is None:
+        claims = _extract(text, nlp)
+        cache.set(key, claims)
+
+    return list(claims)
+
+
+def _extract(text: str, nlp):
+    if PREFILTER:
+        text = prefilter(text)
+        if text is None:
+            return []
+
+    _, pipeline = _route(text, nlp)
+    if pipeline is None:
+        return sentence_claims(text)
+
+    return claims_from_doc(pipeline(text))
+
+
+def extract_atomic_claims_batch(texts, n_process: int = 1, batch_size: int = 64, nlp=None):
+    """
+    Bulk version of extract_atomic_claims().
+    Streams documents through nlp.pipe (optionally across `n_process`
+    worker processes), one pass per language, and returns one claim list
+    per input text, identical to calling extract_atomic_claims on each text.
+    Cached texts, and repeats within `texts`, are parsed at most once.
+    """
+    texts = [normalize_text(text) for text in texts]
+
+    cache = get_parse_cache()
+    if cache is None:
+        return _extract_batch(texts, n_process, batch_size, nlp)
+
+    keys = [parse_cache_key(text, nlp) for text in texts]
+    results = [cache.get(key) for key in keys]
+
+    missing = {}  # key -> text, first occurrence only
+    for key, text, cached in zip(keys, texts, results):
+        if cached is None:
+            missing.setdefault(key, text)
+
+    if missing:
+        parsed = dict(zip(
+            missing,
+            _extract_batch(list(missing.values()), n_process, batch_size, nlp)
+        ))
+        for key, claims in parsed.items():
+            cache.set(key, claims)
+        results = [parsed.get(key, cached) for key, cached in zip(keys, results)]
+
+    return [list(claims) for claims in results]
+
+
+def _extract_batch(texts, n_process: int, batch_size: int, nlp):
+    if PREFILTER:
+        texts = [prefilter(text) for text in texts]
+
+    # Only texts that survived the pre-filter reach a parser
+    results = [[] for _ in texts]
+    by_language = {}
+
+    for i, text in enumerate(texts):
+        if text is not None:
+            by_language.setdefault(detect_language(text), []).append(i)
+
+    for language, indices in by_language.items():
+        _, pipeline = _route(texts[indices[0]], nlp)
+
+        if pipeline is None:
+            for i in indices:
+                results[i] = sentence_claims(texts[i])
+            continue
+
+        disable = [name for name in UNUSED_COMPONENTS if name in pipeline.pipe_names]
+
+        docs = pipeline.pipe(
+            (texts[i] for i in indices),
+            batch_size=batch_size,
+            n_process=n_process,
+            disable=disable
+        )
+
+        for i, doc in zip(indices, docs):
+            results[i] = claims_from_doc(doc)
+
+    return results
+
+
+def claims_from_doc(doc):
+    """
+    Atomic claims of an already parsed spaCy Doc
+    (lets bulk callers parse with nlp.pipe).
     """
-    doc = nlp(text)
     claims = []
 
     for sent in doc.sents:
         sent_text = sent.text.lower()
 
         # Drop obvious non-claims
-        if any(x in sent_text for x in ["share", "forward", "send", "viral"]):
+        if any(x in sent_text for x in NOISE_MARKERS):
             continue
-        if sent_text.startswith("i feel") or sent_text.startswith("i think"):
+        if sent_text.startswith(OPINION_PREFIXES):
             continue
 
         # Find root verb
@@ -208,6 +544,10 @@ if __name__ == "__main__":
 
     print("\n=== CLAIM DECOMPOSER VALIDATION (FINAL) ===\n")
 
+    batch_outputs = extract_atomic_claims_batch(
+        [text for text, _ in TEST_CASES], n_process=2, batch_size=4
+    )
+
     for i, (text, expected) in enumerate(TEST_CASES, start=1):
         output = extract_atomic_claims(text)
 
@@ -217,6 +557,94 @@ if __name__ == "__main__":
         print("Output:  ", output)
 
         if output == expected:
-            print("✅ PASS\n")
+            print("✅ PASS")
+        else:
+            print("❌ FAIL")
+
+        if batch_outputs[i - 1] == output:
+            print("✅ BATCH MATCHES\n")
         else:
-            print("❌ FAIL\n")
+            print("❌ BATCH MISMATCH:", batch_outputs[i - 1], "\n")
+
+    print("\n=== PRE-FILTER ===\n")
+
+    PREFILTER_CASES = [
+        ("Forward this message immediately!!!", None),
+        ("I feel vaccines are dangerous.", None),
+        ("🙏🙏🙏 !!!", None),
+        ("Vaccines cause autism.", "Vaccines cause autism."),
+        ("Vaccines cause autism. Share this fast!", "Vaccines cause autism."),
+        ("पोलियो की दवा खतरनाक है। Share karo!", "पोलियो की दवा खतरनाक है।"),
+        ("Vaccines cause autism\nForward this to everyone", "Vaccines cause autism"),
+        ("Vaccines cause autism!!Forward this", "Vaccines cause autism!!"),
+        ("Forward this\nVaccines cause autism\nGarlic cures cancer",
+         "Vaccines cause autism\nGarlic cures cancer"),
+        ("Take 2.5 mg of zinc. See who.int!", "Take 2.5 mg of zinc. See who.int!"),
+    ]
+
+    for text, expected in PREFILTER_CASES:
+        output = prefilter(text)
+        status = "✅ PASS" if output == expected else "❌ FAIL"
+        print(f"{status}  {text!r} -> {output!r}")
+
+    # The pre-filter must never change what the parser-only path extracts
+    nlp = get_nlp()
+    unfiltered = [claims_from_doc(nlp(text)) for text, _ in TEST_CASES]
+    filtered = [extract_atomic_claims(text) for text, _ in TEST_CASES]
+    print("✅ PASS" if unfiltered == filtered else "❌ FAIL",
+          " claims identical with and without the pre-filter")
+
+    print("\n=== LANGUAGE ROUTING ===\n")
+
+    HINDI_CASES = [
+        (
+            "पोलियो की दवा बच्चों के लिए खतरनाक है।",
+            ["पोलियो की दवा बच्चों के लिए खतरनाक है"]
+        ),
+        (
+            "घरेलू नुस्खों से कैंसर पूरी तरह ठीक हो सकता है। इसे सबको शेयर करें!",
+            ["घरेलू नुस्खों से कैंसर पूरी तरह ठीक हो सकता है"]
+        ),
+        (
+            "पोलियो की दवा खतरनाक है\nइसे सबको शेयर करें",
+            ["पोलियो की दवा खतरनाक है"]
+        ),
+    ]
+
+    # Scripts without a parser (or a language label in the narratives)
+    OTHER_SCRIPT_CASES = [
+        (
+            "پولیو کے قطرے بچوں کے لیے خطرناک ہیں",
+            ["پولیو کے قطرے بچوں کے لیے خطرناک ہیں"]
+        ),
+        (
+            "পোলিও টিকা শিশুদের জন্য বিপজ্জনক।",
+            ["পোলিও টিকা শিশুদের জন্য বিপজ্জনক"]
+        ),
+    ]
+
+    routing_cases = HINDI_CASES + OTHER_SCRIPT_CASES
+    routing_batch = extract_atomic_claims_batch([text for text, _ in routing_cases])
+
+    for (text, expected), batch_output in zip(routing_cases, routing_batch):
+        output = extract_atomic_claims(text)
+        status = "✅ PASS" if output == expected == batch_output else "❌ FAIL"
+        print(f"{status}  {text} -> {output}")
+
+    print("\n=== PARSE CACHE ===\n")
+
+    configure_parse_cache(max_entries=100)
+    first = extract_atomic_claims("Turmeric  cures diabetes.")
+    second = extract_atomic_claims("Turmeric cures diabetes. ")
+    stats = parse_cache_stats()
+    print("✅ PASS" if first == second and stats["hits"] == 1 else "❌ FAIL",
+          " repeated (re-spaced) text served from the cache:", stats)
+
+    import spacy
+
+    override = spacy.blank("en")
+    override.add_pipe("sentencizer")
+    keys = {parse_cache_key("Turmeric cures diabetes."),
+            parse_cache_key("Turmeric cures diabetes.", override)}
+    print("✅ PASS" if len(keys) == 2 else "❌ FAIL",
+          " an nlp override gets its own cache entries")
@@ -0,0 +1,63 @@
+import time
+
+import numpy as np
+
+from evidence_retrieval import RETRIEVAL_MODES, retrieve_evidence
+from verifacts_engine import get_engine
+
+# ============================================================
+# Single-vector vs hybrid (fused) misinformation retrieval
+# Needs the narratives seeded by qdrant_ingestion.py (both vectors)
+# ============================================================
+
+TOP_K = 3
+REPEATS = 20
+
+# (user claim, narrative_id it should retrieve)
+LABELLED_QUERIES = [
+    ("i heard vaccines can make children autistic", "vaccine_autism"),
+    ("vaccination causes autism in kids", "vaccine_autism"),
+    ("vaccines make women infertile", "vaccine_infertility"),
+    ("the covid jab damages fertility", "covid_fertility"),
+    ("polio drops hurt babies", "polio_harm"),
+    ("पोलियो की दवा बच्चों के लिए खतरनाक है", "polio_harm"),
+    ("haldi cures sugar disease", "turmeric_diabetes"),
+    ("turmeric milk reverses diabetes", "turmeric_diabetes"),
+]
+
+
+if __name__ == "__main__":
+    engine = get_engine()
+
+    queries = [q for q, _ in LABELLED_QUERIES]
+    expected = [narrative for _, narrative in LABELLED_QUERIES]
+
+    claim_vectors = engine.embed(queries)
+    medical_vectors = engine.embed_medical(queries)
+
+    print(f"\n=== RETRIEVAL MODES ({len(queries)} claims, top-{TOP_K}) ===\n")
+
+    for mode in RETRIEVAL_MODES:
+        latencies = []
+
+        for _ in range(REPEATS):
+            start = time.perf_counter()
+            evidence = retrieve_evidence(
+                engine.client,
+                claim_vectors,
+                limit=TOP_K,
+                mode=mode,
+                medical_vectors=medical_vectors
+            )
+            latencies.append((time.perf_counter() - start) * 1000)
+
+        hits = sum(
+            narrative in [p.payload.get("narrative_id") for p in claim_evidence["misinfo"]]
+            for narrative, claim_evidence in zip(expected, evidence)
+        )
+
+        print(f"Mode: {mode}")
+        print(f"  recall@{TOP_K}: {hits}/{len(queries)} = {hits / len(queries):.2f}")
+        print(f"  batch latency p50: {np.percentile(latencies, 50):.1f} ms")
+        print(f"  batch latency p95: {np.percentile(latencies, 95):.1f} ms")
+        print("-" * 40)
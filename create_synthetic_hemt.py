@@ -1,3 +1,6 @@
+import argparse
+import random
+
 import pandas as pd
 
 data = [
@@ -86,9 +89,119 @@ data = [
     },
 ]
 
-df = pd.DataFrame(data)
-df.to_csv("synthetic_hemt_fake.csv", index=False)
+# ============================================================
+# Larger corpora (benchmarks): distinct messages from claim templates
+# ============================================================
+
+# Claim templates per (label, language, domain). Slots are filled from
+# SLOTS (or a number range), so generated messages are distinct claims
+# rather than re-framed copies of the hand-written rows above.
+TEMPLATES = [
+    ("fake", "en", "nutrition", "{remedy} can completely cure {disease} in {days} days without medicine."),
+    ("fake", "en", "vaccination", "Vaccines cause {harm} in {pct}% of {group}."),
+    ("fake", "en", "disease", "Drinking {drink} every {hours} hours kills the {virus} virus."),
+    ("real", "en", "nutrition", "A study of {count} patients found no evidence that {remedy} cures {disease}."),
+    ("real", "en", "vaccination", "Vaccines do not cause {harm}, according to data on {count} {group}."),
+    ("real", "en", "disease", "{drink} does not kill the {virus} virus; see a doctor if symptoms last {days} days."),
+    ("fake", "hi", "nutrition", "{remedy_hi} से {disease_hi} {days} दिन में पूरी तरह ठीक हो जाता है।"),
+    ("fake", "hi", "vaccination", "टीके से {pct}% {group_hi} को {harm_hi} होता है।"),
+    ("real", "hi", "nutrition", "{count} मरीज़ों के अध्ययन में {remedy_hi} से {disease_hi} ठीक नहीं हुआ।"),
+    ("real", "hi", "vaccination", "{count} {group_hi} के आंकड़ों के अनुसार टीके से {harm_hi} नहीं होता।"),
+]
+
+SLOTS = {
+    "remedy": ["Turmeric", "Garlic", "Ginger", "Neem juice", "Cinnamon", "Bitter gourd",
+               "Apple cider vinegar", "Cow urine", "Lemon water", "Aloe vera", "Honey", "Fenugreek"],
+    "disease": ["diabetes", "cancer", "hypertension", "asthma", "tuberculosis", "arthritis",
+                "thyroid disease", "kidney stones", "dengue", "malaria"],
+    "harm": ["autism", "infertility", "paralysis", "heart attacks", "blood clots",
+             "memory loss", "diabetes", "epilepsy"],
+    "group": ["children", "women", "men", "teenagers", "elderly people", "pregnant women", "infants"],
+    "drink": ["Hot water", "Lemon tea", "Garlic water", "Turmeric milk", "Salt water",
+              "Ginger tea", "Coconut water", "Herbal kadha"],
+    "virus": ["corona", "flu", "dengue", "Nipah", "measles", "chikungunya"],
+    "remedy_hi": ["हल्दी", "लहसुन", "अदरक", "नीम", "गिलोय", "करेला", "शहद", "मेथी"],
+    "disease_hi": ["मधुमेह", "कैंसर", "अस्थमा", "टीबी", "गठिया", "डेंगू", "मलेरिया"],
+    "harm_hi": ["ऑटिज़्म", "बांझपन", "लकवा", "दिल का दौरा", "मिर्गी"],
+    "group_hi": ["बच्चों", "महिलाओं", "पुरुषों", "बुज़ुर्गों", "गर्भवती महिलाओं"],
+}
+
+NUMBER_SLOTS = {
+    "days": (2, 90),
+    "hours": (1, 12),
+    "pct": (5, 95),
+    "count": (100, 100_000),
+}
+
+# Forwarded-message framing, per language; "{}" is the claim text
+FRAMES = {
+    "en": [
+        "{}",
+        "Forward this to everyone: {}",
+        "My neighbour who is a nurse says {}",
+        "BREAKING: {} Share before it gets deleted!",
+        "I read on WhatsApp that {}",
+        "{} Doctors are hiding this.",
+    ],
+    "hi": [
+        "{}",
+        "सबको भेजें: {}",
+        "डॉक्टर यह नहीं बताएंगे कि {}",
+        "{} इसे ज़्यादा से ज़्यादा शेयर करें।",
+    ],
+}
+
+
+def _fill(template: str, rng: random.Random) -> str:
+    values = {name: rng.choice(options) for name, options in SLOTS.items()}
+    values.update({name: rng.randint(low, high) for name, (low, high) in NUMBER_SLOTS.items()})
+    return template.format(**values)
+
+
+def generate_rows(n_rows: int, seed: int = 0):
+    """
+    `n_rows` HEMT-style rows: the hand-written rows first, then messages
+    from TEMPLATES with random slot values, each in a random forwarding
+    frame. Every generated claim is distinct. Deterministic for a given seed.
+    """
+    rng = random.Random(seed)
+    rows = [dict(row) for row in data[:n_rows]]
+    seen = {row["text"] for row in data}
+
+    while len(rows) < n_rows:
+        label, language, domain, template = rng.choice(TEMPLATES)
+        claim = _fill(template, rng)
+        if claim in seen:
+            continue
+        seen.add(claim)
+
+        rows.append({
+            "id": len(rows) + 1,
+            "text": rng.choice(FRAMES[language]).format(claim),
+            "label": label,
+            "language": language,
+            "domain": domain,
+            "source": ("synthetic" if label == "fake" else "govt") + "_variant",
+        })
+
+    return rows
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Write a synthetic HEMT-style CSV.")
+    parser.add_argument("--rows", type=int, default=len(data),
+                        help="number of rows (default: just the hand-written ones)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="synthetic_hemt_fake.csv")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+
+    df = pd.DataFrame(generate_rows(args.rows, args.seed))
+    df.to_csv(args.output, index=False)
 
-print("✅ Synthetic HEMT-style dataset created: synthetic_hemt_fake.csv")
-print("Shape:", df.shape)
-print(df.head())
+    print(f"✅ Synthetic HEMT-style dataset created: {args.output}")
+    print("Shape:", df.shape)
+    print(df.head())
@@ -0,0 +1,270 @@
+import hashlib
+import json
+import os
+import threading
+from contextlib import contextmanager
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process lock, keep one writer process
+    fcntl = None
+
+# ============================================================
+# Config
+# ============================================================
+
+EMBEDDING_STORE_DIR = "embedding_store"
+
+# ============================================================
+# Embedding store
+# ============================================================
+
+def text_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class EmbeddingStore:
+    """
+    Append-only on-disk cache of embeddings for one model.
+
+    Layout under <root>/<model name>/:
+      meta.json    - model name, dimension, dtype
+      vectors.bin  - raw row-major vectors, read through np.memmap
+      index.tsv    - "<sha256 of text>\\t<row>" lines, appended
+
+    Vectors are written before their index lines, so a crash can only
+    leave unreferenced rows behind, never an index entry without data.
+
+    Safe across threads and (where fcntl is available) across processes:
+    appends hold an exclusive flock on <dir>/.lock, take their row numbers
+    from the size of vectors.bin under it, and every call first picks up
+    index lines other processes appended. A `read_only` store never
+    writes: misses are encoded but not stored.
+    """
+
+    def __init__(
+        self,
+        model_name: str,
+        root: str = EMBEDDING_STORE_DIR,
+        dtype: str = "float32",
+        read_only: bool = False,
+    ):
+        self.model_name = model_name
+        self.directory = os.path.join(root, model_name.replace("/", "__"))
+        self.dtype = np.dtype(dtype)
+        self.dim = None
+        self.read_only = read_only
+
+        self._vectors_path = os.path.join(self.directory, "vectors.bin")
+        self._index_path = os.path.join(self.directory, "index.tsv")
+        self._meta_path = os.path.join(self.directory, "meta.json")
+        self._lock_path = os.path.join(self.directory, ".lock")
+
+        self._index = {}
+        self._index_bytes = 0  # how much of index.tsv has been read
+        self._rows = 0
+        self._mmap = None
+        self._lock = threading.Lock()
+
+        if not read_only:
+            os.makedirs(self.directory, exist_ok=True)
+
+        self._refresh()
+
+    def __len__(self):
+        return len(self._index)
+
+    # -----------------------------
+    # Cross-process state
+    # -----------------------------
+    @contextmanager
+    def _file_lock(self):
+        if fcntl is None:
+            yield
+            return
+
+        with open(self._lock_path, "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _row_bytes(self):
+        return self.dim * self.dtype.itemsize
+
+    def _refresh(self):
+        """
+        Pick up the meta file, complete index lines and vector rows
+        written since the last call (by this or another process).
+        Caller holds self._lock (or is __init__).
+        """
+        if self.dim is None and os.path.exists(self._meta_path):
+            with open(self._meta_path, encoding="utf-8") as f:
+                meta = json.load(f)
+            self.dim = meta["dim"]
+            self.dtype = np.dtype(meta["dtype"])
+
+        if os.path.exists(self._index_path):
+            size = os.path.getsize(self._index_path)
+            if size > self._index_bytes:
+                with open(self._index_path, "rb") as f:
+                    f.seek(self._index_bytes)
+                    data = f.read(size - self._index_bytes)
+
+                # A line still being appended is read next time
+                end = data.rfind(b"\n") + 1
+                for line in data[:end].decode("utf-8").splitlines():
+                    key, _, row = line.partition("\t")
+                    if row:
+                        self._index[key] = int(row)
+                self._index_bytes += end
+
+        if self.dim and os.path.exists(self._vectors_path):
+            self._rows = os.path.getsize(self._vectors_path) // self._row_bytes()
+
+    def _matrix(self):
+        # Re-map whenever rows were appended since the last mapping
+        if self._mmap is None or len(self._mmap) != self._rows:
+            self._mmap = np.memmap(
+                self._vectors_path, dtype=self.dtype, mode="r",
+                shape=(self._rows, self.dim)
+            )
+        return self._mmap
+
+    def get_many(self, texts):
+        """
+        Returns (vectors, missing) where vectors[i] is a float32 row or None
+        and missing lists the positions of texts with no stored vector.
+        """
+        with self._lock:
+            self._refresh()
+            rows = [self._index.get(text_hash(t)) for t in texts]
+            matrix = self._matrix() if self._rows else None
+
+            vectors = [
+                np.asarray(matrix[row], dtype=np.float32) if row is not None else None
+                for row in rows
+            ]
+
+        missing = [i for i, v in enumerate(vectors) if v is None]
+        return vectors, missing
+
+    def put_many(self, texts, vectors):
+        if self.read_only:
+            return
+
+        vectors = np.atleast_2d(np.asarray(vectors))
+
+        with self._lock, self._file_lock():
+            self._refresh()
+
+            if self.dim is None:
+                self.dim = int(vectors.shape[1])
+                with open(self._meta_path, "w", encoding="utf-8") as f:
+                    json.dump(
+                        {"model_name": self.model_name, "dim": self.dim, "dtype": self.dtype.name},
+                        f
+                    )
+
+            new = {}
+            for text, vector in zip(texts, vectors):
+                key = text_hash(text)
+                if key not in self._index and key not in new:
+                    new[key] = vector
+
+            if not new:
+                return
+
+            rows = np.stack(list(new.values())).astype(self.dtype, copy=False)
+
+            with open(self._vectors_path, "ab") as f:
+                # Drop a partial row left by a crashed writer
+                start = f.tell() // self._row_bytes()
+                f.truncate(start * self._row_bytes())
+                f.write(np.ascontiguousarray(rows).tobytes())
+                f.flush()
+                os.fsync(f.fileno())
+
+            with open(self._index_path, "a", encoding="utf-8") as f:
+                for offset, key in enumerate(new):
+                    f.write(f"{key}\t{start + offset}\n")
+
+            # Reads back our own lines, like any other writer's
+            self._refresh()
+
+    def encode(self, texts, encode_fn):
+        """
+        Look texts up first, call `encode_fn(list_of_texts) -> array` only
+        for the misses (once, batched), store them, and return one float32
+        matrix in input order.
+        """
+        texts = list(texts)
+        vectors, missing = self.get_many(texts)
+
+        if missing:
+            unique = list(dict.fromkeys(texts[i] for i in missing))
+            encoded = np.asarray(encode_fn(unique))
+            self.put_many(unique, encoded)
+
+            by_text = dict(zip(unique, encoded))
+            for i in missing:
+                vectors[i] = by_text[texts[i]]
+
+        if not texts:
+            return np.zeros((0, self.dim or 0), dtype=np.float32)
+
+        return np.vstack(vectors).astype(np.float32, copy=False)
+
+# ============================================================
+# Validation Tests
+# ============================================================
+
+if __name__ == "__main__":
+    import tempfile
+
+    print("\n=== EMBEDDING STORE VALIDATION ===\n")
+
+    checks = []
+    calls = []
+
+    def fake_encode(texts):
+        calls.append(list(texts))
+        return np.array([[len(t), 1.0, 0.5] for t in texts], dtype=np.float32)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = EmbeddingStore("org/model", root=tmp, dtype="float16")
+
+        first = store.encode(["a", "bb", "a"], fake_encode)
+        checks.append(("misses encoded once, batched", calls == [["a", "bb"]]))
+        checks.append(("float32 matrix returned", first.dtype == np.float32 and first.shape == (3, 3)))
+
+        second = store.encode(["bb", "ccc"], fake_encode)
+        checks.append(("only new texts encoded", calls[-1] == ["ccc"]))
+        checks.append(("stored rows reused", np.allclose(second[0], first[1])))
+
+        reopened = EmbeddingStore("org/model", root=tmp)
+        vectors, missing = reopened.get_many(["a", "ccc", "dddd"])
+        checks.append(("persisted across reopen", missing == [2] and np.allclose(vectors[1], second[1])))
+        checks.append(("dtype kept from meta", reopened.dtype == np.float16 and len(reopened) == 3))
+
+        # Two writers on one directory (as two processes would be)
+        other = EmbeddingStore("org/model", root=tmp)
+        store.put_many(["x"], fake_encode(["x"]))
+        other.put_many(["yyyy"], fake_encode(["yyyy"]))
+        store.put_many(["zz"], fake_encode(["zz"]))
+
+        reopened = EmbeddingStore("org/model", root=tmp)
+        vectors, _ = reopened.get_many(["x", "yyyy", "zz"])
+        checks.append(("concurrent writers get distinct rows",
+                       [float(v[0]) for v in vectors] == [1.0, 4.0, 2.0]))
+        checks.append(("other writers' rows picked up", store.get_many(["yyyy"])[1] == []))
+
+        read_only = EmbeddingStore("org/model", root=tmp, read_only=True)
+        read_only.encode(["never stored"], fake_encode)
+        checks.append(("read-only store never writes", reopened.get_many(["never stored"])[1] == [0]))
+
+    for i, (name, ok) in enumerate(checks, start=1):
+        print(f"Check {i}: {name}: {'✅ PASS' if ok else '❌ FAIL'}")
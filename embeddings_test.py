@@ -3,16 +3,9 @@
 # ================================
 
 from sentence_transformers import SentenceTransformer
-from transformers import AutoTokenizer, AutoModel
 from sklearn.metrics.pairwise import cosine_similarity
-import torch
 import numpy as np
-
-# ----------------
-# Device selection
-# ----------------
-device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
-print(f"Using device: {device}")
+from medical_embeddings import MEDICAL_MODEL_NAME, embed_medical_batch, get_medical_model
 
 # ------------------------------------
 # Step 2.1: Load multilingual model
@@ -27,14 +20,10 @@ print("Claim model loaded successfully")
 # Step 2.2: Load medical-domain model
 # ------------------------------------
 print("Loading medical domain model...")
-medical_model_name = "pritamdeka/BioBERT-mnli-snli-scinli-scitail-mednli-stsb"
-
-medical_tokenizer = AutoTokenizer.from_pretrained(medical_model_name)
-medical_model = AutoModel.from_pretrained(medical_model_name)
-medical_model.to(device)
-medical_model.eval()
+_, _, device = get_medical_model()
 
-print("Medical model loaded successfully")
+print(f"Medical model loaded successfully ({MEDICAL_MODEL_NAME})")
+print(f"Using device: {device}")
 
 # ------------------------------------
 # Step 2.3: Define test claims
@@ -50,24 +39,11 @@ claims = [
 print("Test claims loaded")
 
 # ------------------------------------
-# Step 2.4: Embedding functions
+# Step 2.4: Generate embeddings
 # ------------------------------------
-def embed_medical(text: str):
-    inputs = medical_tokenizer(
-        text,
-        return_tensors="pt",
-        truncation=True,
-        padding=True
-    )
-    inputs = {k: v.to(device) for k, v in inputs.items()}
-    with torch.no_grad():
-        outputs = medical_model(**inputs)
-    # Mean pooling over token embeddings
-    return outputs.last_hidden_state.mean(dim=1).cpu().numpy()
-
-# Generate embeddings
 claim_embeddings = claim_model.encode(claims)
-medical_embeddings = np.vstack([embed_medical(c) for c in claims])
+# Batched, attention-mask aware mean pooling
+medical_embeddings = embed_medical_batch(claims)
 
 print("Claim text embeddings shape:", claim_embeddings.shape)
 print("Medical embeddings shape:", medical_embeddings.shape)
@@ -0,0 +1,458 @@
+import asyncio
+from contextlib import nullcontext
+
+# ============================================================
+# Config
+# ============================================================
+
+MISINFO_COLLECTION = "health_claim_memory"
+FACT_COLLECTION = "health_fact_base"
+
+MISINFO_VECTOR_NAME = "claim_text_embedding"
+MEDICAL_VECTOR_NAME = "medical_context_embedding"
+FACT_VECTOR_NAME = "fact_embedding"
+
+SEARCH_LIMIT = 2
+
+# Misinformation search modes:
+#   "single" - claim_text_embedding only
+#   "hybrid" - claim_text_embedding + medical_context_embedding, fused
+#              server-side (one request per claim, still one batch)
+RETRIEVAL_MODES = ("single", "hybrid")
+HYBRID_FUSION = "rrf"          # "rrf" (reciprocal rank) or "dbsf" (score-distribution)
+HYBRID_PREFETCH_LIMIT = 10     # candidates taken from each vector before fusion
+
+# Query-time search parameters. Rescoring/oversampling only matter for
+# collections provisioned with quantization (see qdrant_setup.py).
+SEARCH_HNSW_EF = None          # None = collection default
+SEARCH_RESCORE = True
+SEARCH_OVERSAMPLING = 2.0
+
+# Payload fields each collection can be filtered on (keyword-indexed by
+# qdrant_setup.py). Facts carry no language: they are matched cross-lingually.
+FILTER_FIELDS = {
+    MISINFO_COLLECTION: ("language", "domain"),
+    FACT_COLLECTION: ("domain",),
+}
+
+# Filtered hits below this cosine score trigger an unfiltered retry
+FILTER_FALLBACK_SCORE = 0.5
+
+# Stage names reported to a `timer` (see pipeline_metrics.STAGES)
+SEARCH_STAGES = {
+    MISINFO_COLLECTION: "search_misinfo",
+    FACT_COLLECTION: "search_fact",
+}
+
+# ============================================================
+# Batched retrieval
+# ============================================================
+
+def _no_timer(stage):
+    return nullcontext()
+
+
+def _search_params():
+    # Imported here so importing the pipeline stays cheap
+    from qdrant_setup import search_params
+
+    return search_params(
+        hnsw_ef=SEARCH_HNSW_EF,
+        rescore=SEARCH_RESCORE,
+        oversampling=SEARCH_OVERSAMPLING
+    )
+
+
+def _payload_filter(spec, fields):
+    """
+    Qdrant Filter from a {"language": ..., "domain": ...} spec,
+    restricted to the payload fields the collection carries.
+    """
+    from qdrant_client.models import FieldCondition, Filter, MatchValue
+
+    conditions = [
+        FieldCondition(key=field, match=MatchValue(value=spec[field]))
+        for field in fields
+        if spec and spec.get(field)
+    ]
+    return Filter(must=conditions) if conditions else None
+
+
+def _batch_requests(claim_vectors, using: str, limit: int, query_filters):
+    """
+    One QueryRequest per claim vector, all against the same named vector.
+    """
+    from qdrant_client.models import QueryRequest
+
+    params = _search_params()
+
+    return [
+        QueryRequest(
+            query=[float(x) for x in vector],
+            using=using,
+            filter=query_filter,
+            limit=limit,
+            params=params,
+            with_payload=True
+        )
+        for vector, query_filter in zip(claim_vectors, query_filters)
+    ]
+
+
+def _hybrid_requests(claim_vectors, medical_vectors, limit: int, query_filters):
+    """
+    One fused QueryRequest per claim: both named vectors are prefetched
+    and Qdrant merges the two candidate lists itself.
+    """
+    from qdrant_client.models import Fusion, FusionQuery, Prefetch, QueryRequest
+
+    fusion = {"rrf": Fusion.RRF, "dbsf": Fusion.DBSF}[HYBRID_FUSION]
+    params = _search_params()
+
+    return [
+        QueryRequest(
+            prefetch=[
+                Prefetch(
+                    query=[float(x) for x in claim_vector],
+                    using=MISINFO_VECTOR_NAME,
+                    filter=query_filter,
+                    limit=HYBRID_PREFETCH_LIMIT,
+                    params=params
+                ),
+                Prefetch(
+                    query=[float(x) for x in medical_vector],
+                    using=MEDICAL_VECTOR_NAME,
+                    filter=query_filter,
+                    limit=HYBRID_PREFETCH_LIMIT,
+                    params=params
+                ),
+            ],
+            query=FusionQuery(fusion=fusion),
+            limit=limit,
+            with_payload=True
+        )
+        for claim_vector, medical_vector, query_filter
+        in zip(claim_vectors, medical_vectors, query_filters)
+    ]
+
+
+def _collection_requests(collection, rows, claim_vectors, limit, mode, medical_vectors, filters):
+    """
+    QueryRequests for the given claim rows against one collection.
+    `filters` is None (unfiltered) or one filter spec per claim.
+    """
+    fields = FILTER_FIELDS[collection]
+    query_filters = [
+        _payload_filter(filters[i], fields) if filters else None
+        for i in rows
+    ]
+    vectors = [claim_vectors[i] for i in rows]
+
+    if collection == FACT_COLLECTION or mode == "single":
+        using = FACT_VECTOR_NAME if collection == FACT_COLLECTION else MISINFO_VECTOR_NAME
+        return _batch_requests(vectors, using, limit, query_filters)
+
+    return _hybrid_requests(
+        vectors, [medical_vectors[i] for i in rows], limit, query_filters
+    )
+
+
+def _local_search(index, rows, claim_vectors, limit, filters, collection):
+    """
+    _collection_requests() counterpart for an in-process LocalVectorIndex:
+    the hits for the given rows, searched exactly without a round-trip.
+    """
+    return index.search(
+        [claim_vectors[i] for i in rows],
+        limit,
+        filters=[filters[i] for i in rows] if filters else None,
+        fields=FILTER_FIELDS[collection],
+    )
+
+
+def _local_index(local_indexes, collection, mode):
+    # Local indexes hold one named vector, so hybrid misinfo search stays in Qdrant
+    if not local_indexes or (collection == MISINFO_COLLECTION and mode != "single"):
+        return None
+    return local_indexes.get(collection)
+
+
+def _weak_rows(points_per_row, limit: int, mode: str, collection: str):
+    """
+    Rows whose filtered search came back thin: fewer than `limit` hits,
+    or (for cosine scores) a best hit below FILTER_FALLBACK_SCORE.
+    Fused hybrid scores are rank-based, so only the count applies there.
+    """
+    cosine = mode == "single" or collection == FACT_COLLECTION
+
+    return [
+        row for row, points in enumerate(points_per_row)
+        if len(points) < limit
+        or (cosine and points[0].score < FILTER_FALLBACK_SCORE)
+    ]
+
+
+def _check_args(claim_vectors, mode, medical_vectors, filters):
+    if mode not in RETRIEVAL_MODES:
+        raise ValueError(f"Unknown retrieval mode {mode!r}, expected one of {RETRIEVAL_MODES}")
+    if mode == "hybrid" and medical_vectors is None:
+        raise ValueError("Hybrid retrieval needs medical_vectors")
+    if filters is not None and len(filters) != len(claim_vectors):
+        raise ValueError("Expected one filter spec per claim vector")
+
+
+def _assemble(points_by_collection):
+    return [
+        {"misinfo": misinfo, "facts": facts}
+        for misinfo, facts in zip(
+            points_by_collection[MISINFO_COLLECTION],
+            points_by_collection[FACT_COLLECTION]
+        )
+    ]
+
+
+def retrieve_evidence(
+    client,
+    claim_vectors,
+    limit: int = SEARCH_LIMIT,
+    mode: str = "single",
+    medical_vectors=None,
+    filters=None,
+    timer=None,
+    local_indexes=None
+):
+    """
+    Retrieve misinformation narratives and verified facts for many claims.
+
+    Qdrant batches are scoped to one collection, so every claim's
+    misinformation lookup travels in one query_batch_points request and
+    every claim's fact lookup in a second one. The cost is two round-trips
+    per message instead of two per claim.
+
+    mode="hybrid" also searches medical_context_embedding with the
+    matching rows of `medical_vectors` and fuses both rankings server-side.
+    Facts only have one vector and are always searched by claim text.
+
+    `filters` (one {"language": ..., "domain": ...} spec per claim, see
+    claim_context.claim_filters) restricts each search to matching
+    payloads. Claims whose filtered results are weak are searched again
+    unfiltered, in one more batch per collection.
+
+    `timer(stage)`, if given, returns a context manager timing each
+    collection's search ("search_misinfo" / "search_fact", see SEARCH_STAGES).
+
+    `local_indexes` ({collection: LocalVectorIndex}, see local_index.py)
+    answers those collections in-process instead, with the same filtering
+    and fallback.
+
+    Returns one dict per claim vector, in input order:
+        {"misinfo": [ScoredPoint, ...], "facts": [ScoredPoint, ...]}
+    """
+    if len(claim_vectors) == 0:
+        return []
+
+    _check_args(claim_vectors, mode, medical_vectors, filters)
+
+    all_rows = range(len(claim_vectors))
+    timer = timer or _no_timer
+    results = {}
+
+    for collection in (MISINFO_COLLECTION, FACT_COLLECTION):
+        index = _local_index(local_indexes, collection, mode)
+
+        with timer(SEARCH_STAGES[collection]):
+            if index is not None:
+                results[collection] = _local_search(
+                    index, all_rows, claim_vectors, limit, filters, collection
+                )
+            else:
+                responses = client.query_batch_points(
+                    collection_name=collection,
+                    requests=_collection_requests(
+                        collection, all_rows, claim_vectors, limit, mode, medical_vectors, filters
+                    )
+                )
+                results[collection] = [r.points for r in responses]
+
+            if filters is None:
+                continue
+
+            weak = _weak_rows(results[collection], limit, mode, collection)
+            if weak and index is not None:
+                fallback = _local_search(index, weak, claim_vectors, limit, None, collection)
+                for row, points in zip(weak, fallback):
+                    results[collection][row] = points
+            elif weak:
+                fallback = client.query_batch_points(
+                    collection_name=collection,
+                    requests=_collection_requests(
+                        collection, weak, claim_vectors, limit, mode, medical_vectors, None
+                    )
+                )
+                for row, response in zip(weak, fallback):
+                    results[collection][row] = response.points
+
+    return _assemble(results)
+
+
+async def retrieve_evidence_async(
+    client,
+    claim_vectors,
+    limit: int = SEARCH_LIMIT,
+    mode: str = "single",
+    medical_vectors=None,
+    filters=None,
+    timer=None,
+    local_indexes=None
+):
+    """
+    Async counterpart of retrieve_evidence().
+    Both collections are searched (and fall back) concurrently.
+    """
+    if len(claim_vectors) == 0:
+        return []
+
+    _check_args(claim_vectors, mode, medical_vectors, filters)
+
+    all_rows = range(len(claim_vectors))
+    timer = timer or _no_timer
+
+    async def search(collection):
+        with timer(SEARCH_STAGES[collection]):
+            return await _search(collection)
+
+    async def _search(collection):
+        index = _local_index(local_indexes, collection, mode)
+        if index is not None:
+            points = _local_search(index, all_rows, claim_vectors, limit, filters, collection)
+            weak = _weak_rows(points, limit, mode, collection) if filters is not None else []
+            if weak:
+                fallback = _local_search(index, weak, claim_vectors, limit, None, collection)
+                for row, row_points in zip(weak, fallback):
+                    points[row] = row_points
+            return points
+
+        responses = await client.query_batch_points(
+            collection_name=collection,
+            requests=_collection_requests(
+                collection, all_rows, claim_vectors, limit, mode, medical_vectors, filters
+            )
+        )
+        points = [r.points for r in responses]
+
+        if filters is None:
+            return points
+
+        weak = _weak_rows(points, limit, mode, collection)
+        if weak:
+            fallback = await client.query_batch_points(
+                collection_name=collection,
+                requests=_collection_requests(
+                    collection, weak, claim_vectors, limit, mode, medical_vectors, None
+                )
+            )
+            for row, response in zip(weak, fallback):
+                points[row] = response.points
+
+        return points
+
+    misinfo, facts = await asyncio.gather(
+        search(MISINFO_COLLECTION), search(FACT_COLLECTION)
+    )
+
+    return _assemble({MISINFO_COLLECTION: misinfo, FACT_COLLECTION: facts})
+
+
+# ============================================================
+# Validation (in-memory Qdrant, no server needed)
+# ============================================================
+
+if __name__ == "__main__":
+    from qdrant_client import QdrantClient
+    from qdrant_client.models import VectorParams, Distance, PointStruct
+
+    test_client = QdrantClient(":memory:")
+
+    test_client.create_collection(
+        collection_name=MISINFO_COLLECTION,
+        vectors_config={
+            MISINFO_VECTOR_NAME: VectorParams(size=3, distance=Distance.COSINE),
+            MEDICAL_VECTOR_NAME: VectorParams(size=2, distance=Distance.COSINE),
+        }
+    )
+    test_client.create_collection(
+        collection_name=FACT_COLLECTION,
+        vectors_config={
+            FACT_VECTOR_NAME: VectorParams(size=3, distance=Distance.COSINE)
+        }
+    )
+
+    test_client.upsert(
+        collection_name=MISINFO_COLLECTION,
+        points=[
+            PointStruct(id=1, vector={MISINFO_VECTOR_NAME: [1, 0, 0], MEDICAL_VECTOR_NAME: [1, 0]},
+                        payload={"claim_text": "vaccines cause autism",
+                                 "language": "en", "domain": "vaccination"}),
+            PointStruct(id=2, vector={MISINFO_VECTOR_NAME: [0, 1, 0], MEDICAL_VECTOR_NAME: [0, 1]},
+                        payload={"claim_text": "turmeric cures diabetes",
+                                 "language": "en", "domain": "nutrition"}),
+            PointStruct(id=3, vector={MISINFO_VECTOR_NAME: [0.8, 0.2, 0], MEDICAL_VECTOR_NAME: [1, 0]},
+                        payload={"claim_text": "टीके से ऑटिज़्म होता है",
+                                 "language": "hi", "domain": "vaccination"}),
+        ]
+    )
+    test_client.upsert(
+        collection_name=FACT_COLLECTION,
+        points=[
+            PointStruct(id=1, vector={FACT_VECTOR_NAME: [1, 0.1, 0]},
+                        payload={"fact_text": "Vaccines do not cause autism."}),
+            PointStruct(id=2, vector={FACT_VECTOR_NAME: [0, 1, 0.1]},
+                        payload={"fact_text": "Turmeric does not cure diabetes."}),
+        ]
+    )
+
+    evidence = retrieve_evidence(
+        test_client,
+        [[0.9, 0.1, 0.0], [0.1, 0.9, 0.0]],
+        limit=1
+    )
+
+    hybrid = retrieve_evidence(
+        test_client,
+        [[0.9, 0.1, 0.0], [0.1, 0.9, 0.0]],
+        limit=1,
+        mode="hybrid",
+        medical_vectors=[[0.9, 0.1], [0.2, 0.8]]
+    )
+
+    # Hindi claim: filtered to the Hindi narrative even though the English
+    # one is closer; a domain with no stored narratives falls back.
+    filtered = retrieve_evidence(
+        test_client,
+        [[0.9, 0.1, 0.0], [0.9, 0.1, 0.0]],
+        limit=1,
+        filters=[
+            {"language": "hi", "domain": "vaccination"},
+            {"language": "en", "domain": "disease"},
+        ]
+    )
+
+    print("\n=== BATCH RETRIEVAL VALIDATION ===\n")
+
+    checks = [
+        (evidence[0]["misinfo"][0].id, 1),
+        (evidence[0]["facts"][0].id, 1),
+        (evidence[1]["misinfo"][0].id, 2),
+        (evidence[1]["facts"][0].id, 2),
+        (retrieve_evidence(test_client, []), []),
+        (hybrid[0]["misinfo"][0].id, 1),
+        (hybrid[1]["misinfo"][0].id, 2),
+        (hybrid[1]["facts"][0].id, 2),
+        (filtered[0]["misinfo"][0].id, 3),
+        (filtered[1]["misinfo"][0].id, 1),
+        (filtered[1]["facts"][0].id, 1),
+    ]
+
+    for i, (output, expected) in enumerate(checks, start=1):
+        status = "✅ PASS" if output == expected else "❌ FAIL"
+        print(f"Check {i}: expected={expected} output={output} {status}")
@@ -1,8 +1,13 @@
+import json
+import os
+import uuid
+
 import pandas as pd
 from sentence_transformers import SentenceTransformer
 from qdrant_client import QdrantClient
 from qdrant_client.models import PointStruct
-from claim_decomposer import extract_atomic_claims
+from claim_decomposer import extract_atomic_claims_batch
+from embedding_store import EmbeddingStore
 
 # ============================================================
 # CONFIG
@@ -11,49 +16,145 @@ from claim_decomposer import extract_atomic_claims
 DATA_PATH = "synthetic_hemt_fake.csv"
 COLLECTION_NAME = "health_claim_memory"
 VECTOR_NAME = "claim_text_embedding"
+MODEL_NAME = "sentence-transformers/paraphrase-multilingual-mpnet-base-v2"
+
+# Point IDs are UUIDv5(claim language + text): re-ingesting the same claim
+# always lands on the same point, and never clashes with manual seeds.
+POINT_ID_NAMESPACE = uuid.uuid5(uuid.NAMESPACE_URL, "verifacts/health_claim_memory")
+
+# Progress marker, rewritten after every committed chunk
+CHECKPOINT_PATH = "hemt_fake_ingest.checkpoint.json"
 
-START_ID = 1000  # avoid clashing with manual seeds
+# Streaming knobs: peak memory is bounded by these, not by the file size
+CSV_CHUNK_ROWS = 2_000    # rows read from the CSV at a time
+NLP_BATCH_SIZE = 64       # docs per nlp.pipe batch
+NLP_PROCESSES = 1         # spaCy worker processes (-1 = all cores)
+EMBED_BATCH_SIZE = 64     # claims per encoder forward pass
+UPSERT_BATCH_SIZE = 256   # points per Qdrant upsert request
+UPLOAD_PARALLEL = 1       # >1 uploads batches from worker processes
 
 # ============================================================
 # INIT
 # ============================================================
 
-print("Loading dataset...")
-df = pd.read_csv(DATA_PATH)
-
 client = QdrantClient(url="http://localhost:6333")
 
-embedding_model = SentenceTransformer(
-    "sentence-transformers/paraphrase-multilingual-mpnet-base-v2"
-)
+embedding_model = SentenceTransformer(MODEL_NAME)
+
+# Vectors from earlier runs are reused instead of re-encoded
+store = EmbeddingStore(MODEL_NAME)
+
+# ============================================================
+# IDS + CHECKPOINTS
+# ============================================================
+
+def claim_point_id(claim: str, language) -> str:
+    return str(uuid.uuid5(POINT_ID_NAMESPACE, f"{language}:{claim}"))
+
+
+def load_checkpoint(path: str) -> int:
+    """
+    Number of CSV rows already committed for `path` (0 when starting fresh).
+    """
+    if not os.path.exists(CHECKPOINT_PATH):
+        return 0
+
+    with open(CHECKPOINT_PATH, encoding="utf-8") as f:
+        checkpoint = json.load(f)
+
+    if checkpoint.get("data_path") != os.path.abspath(path):
+        return 0
+
+    return checkpoint["rows_committed"]
+
+
+def save_checkpoint(path: str, rows_committed: int):
+    tmp_path = CHECKPOINT_PATH + ".tmp"
+
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(
+            {"data_path": os.path.abspath(path), "rows_committed": rows_committed},
+            f
+        )
 
-points = []
-point_id = START_ID
+    # Atomic swap: a crash never leaves a half-written checkpoint
+    os.replace(tmp_path, CHECKPOINT_PATH)
 
 # ============================================================
-# PROCESS DATASET
+# STREAMING STAGES
 # ============================================================
 
-for idx, row in df.iterrows():
-    label = str(row["label"]).lower()
+def iter_claim_chunks(path: str, skip_rows: int = 0):
+    """
+    Read the CSV chunk by chunk, starting after `skip_rows` data rows.
+    Yields (rows_in_chunk, claims) where claims are the chunk's
+    misinformation claims as (claim, language, domain) tuples.
+    """
+    chunks = pd.read_csv(
+        path,
+        chunksize=CSV_CHUNK_ROWS,
+        skiprows=range(1, skip_rows + 1)  # keep the header row
+    )
+
+    for chunk in chunks:
+        rows_in_chunk = len(chunk)
+
+        # Only ingest misinformation
+        chunk = chunk[chunk["label"].astype(str).str.lower() == "fake"]
+        if chunk.empty:
+            yield rows_in_chunk, []
+            continue
 
-    # Only ingest misinformation
-    if label != "fake":
-        continue
+        texts = chunk["text"].astype(str).tolist()
+        languages = chunk["language"] if "language" in chunk else ["unknown"] * len(chunk)
+        domains = chunk["domain"] if "domain" in chunk else ["unknown"] * len(chunk)
+
+        claim_lists = extract_atomic_claims_batch(
+            texts,
+            n_process=NLP_PROCESSES,
+            batch_size=NLP_BATCH_SIZE
+        )
 
-    text = str(row["text"])
-    language = row.get("language", "unknown")
-    domain = row.get("domain", "unknown")
+        yield rows_in_chunk, [
+            (claim, language, domain)
+            for claims, language, domain in zip(claim_lists, languages, domains)
+            for claim in claims
+        ]
 
-    # Extract atomic claims
-    claims = extract_atomic_claims(text)
 
-    for claim in claims:
-        vector = embedding_model.encode(claim).tolist()
+def build_new_points(claims):
+    """
+    Embed and wrap only the claims not already stored in the collection.
+    """
+    by_id = {}
+    for claim, language, domain in claims:
+        by_id.setdefault(claim_point_id(claim, language), (claim, language, domain))
+
+    existing = client.retrieve(
+        collection_name=COLLECTION_NAME,
+        ids=list(by_id),
+        with_payload=False,
+        with_vectors=False,
+    )
+    for point in existing:
+        by_id.pop(str(point.id), None)
+
+    if not by_id:
+        return []
+
+    vectors = store.encode(
+        [claim for claim, _, _ in by_id.values()],
+        lambda misses: embedding_model.encode(
+            misses,
+            batch_size=EMBED_BATCH_SIZE,
+            convert_to_numpy=True
+        )
+    )
 
-        point = PointStruct(
+    return [
+        PointStruct(
             id=point_id,
-            vector={VECTOR_NAME: vector},
+            vector={VECTOR_NAME: vector.tolist()},
             payload={
                 "claim_text": claim,
                 "domain": domain,
@@ -62,18 +163,39 @@ for idx, row in df.iterrows():
                 "source_dataset": "synthetic_hemt",
             },
         )
-
-        points.append(point)
-        point_id += 1
+        for (point_id, (claim, language, domain)), vector in zip(by_id.items(), vectors)
+    ]
 
 # ============================================================
 # INGEST INTO QDRANT
 # ============================================================
 
-if points:
-    client.upsert(
-        collection_name=COLLECTION_NAME,
-        points=points,
-    )
+if __name__ == "__main__":
+    rows_committed = load_checkpoint(DATA_PATH)
+    if rows_committed:
+        print(f"Resuming after {rows_committed} committed rows...")
+    else:
+        print("Streaming dataset...")
+
+    ingested = 0
+
+    for rows_in_chunk, claims in iter_claim_chunks(DATA_PATH, rows_committed):
+        points = build_new_points(claims) if claims else []
+
+        if points:
+            client.upload_points(
+                collection_name=COLLECTION_NAME,
+                points=points,
+                batch_size=UPSERT_BATCH_SIZE,
+                parallel=UPLOAD_PARALLEL,
+                wait=True,
+            )
+
+        # Only advance the checkpoint once the chunk is durably stored
+        rows_committed += rows_in_chunk
+        save_checkpoint(DATA_PATH, rows_committed)
+
+        ingested += len(points)
+        print(f"  {rows_committed} rows committed, {ingested} new claims")
 
-print(f"✅ Ingested {len(points)} misinformation claims into Qdrant")
+    print(f"✅ Ingested {ingested} misinformation claims into Qdrant")
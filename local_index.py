@@ -0,0 +1,389 @@
+import asyncio
+import time
+
+import numpy as np
+
+from evidence_retrieval import FILTER_FIELDS
+
+# ============================================================
+# Config
+# ============================================================
+
+# Collections at or below this many points are searched in-process
+LOCAL_INDEX_MAX_POINTS = 10_000
+
+# Reload from Qdrant at least this often (seconds); a fact-base version
+# bump reloads immediately
+LOCAL_INDEX_REFRESH_SECONDS = 300
+
+SCROLL_PAGE_SIZE = 1_000
+
+# ============================================================
+# In-process exact search over a small collection
+# ============================================================
+
+class LocalVectorIndex:
+    """
+    One named vector of a Qdrant collection held as a row-normalized
+    float32 matrix, searched exactly: a batch of claim vectors is scored
+    with one matrix product.
+
+    Cosine scores equal Qdrant's, and hits are ScoredPoint objects with
+    the stored payloads, so results are interchangeable with a Qdrant
+    search. Payload filters use the same {"field": value} specs as
+    evidence_retrieval (exact match on every given field); row masks are
+    only kept for `filter_fields` (default: FILTER_FIELDS of the collection).
+    """
+
+    def __init__(
+        self,
+        collection_name: str,
+        vector_name: str,
+        max_points: int = LOCAL_INDEX_MAX_POINTS,
+        refresh_seconds: float = LOCAL_INDEX_REFRESH_SECONDS,
+        filter_fields=None,
+    ):
+        self.collection_name = collection_name
+        self.vector_name = vector_name
+        if filter_fields is None:
+            filter_fields = FILTER_FIELDS.get(collection_name, ())
+        self.filter_fields = tuple(filter_fields)
+        self.max_points = max_points
+        self.refresh_seconds = refresh_seconds
+
+        self.version = None
+        self.loaded_at = None
+        self.too_large = False
+
+        self._ids = []
+        self._payloads = []
+        self._matrix = np.zeros((0, 0), dtype=np.float32)
+        self._masks = {}  # field -> value -> bool row mask
+
+        self._lock = None
+
+    def __len__(self):
+        return len(self._ids)
+
+    @property
+    def ready(self) -> bool:
+        """
+        Loaded and small enough to be searched in-process.
+        """
+        return self.loaded_at is not None and not self.too_large
+
+    def is_fresh(self, version=None) -> bool:
+        return (
+            self.loaded_at is not None
+            and version == self.version
+            and time.monotonic() - self.loaded_at < self.refresh_seconds
+        )
+
+    # -----------------------------
+    # Loading
+    # -----------------------------
+    def _build(self, records):
+        # CPU-bound (~0.5 s at 10k points): refresh_async runs it in a thread
+        ids, payloads, rows = [], [], []
+
+        for record in records:
+            vector = record.vector
+            if isinstance(vector, dict):
+                vector = vector.get(self.vector_name)
+            if vector is None:
+                continue
+
+            ids.append(record.id)
+            payloads.append(record.payload or {})
+            rows.append(vector)
+
+        # An empty collection gives a (0, 0) matrix: every search returns []
+        matrix = np.asarray(rows, dtype=np.float32).reshape(len(rows), -1 if rows else 0)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        matrix /= np.where(norms == 0, 1, norms)
+
+        # Only filterable fields: free text would need one mask per point
+        masks = {}
+        for field in self.filter_fields:
+            for row, payload in enumerate(payloads):
+                value = payload.get(field)
+                for item in (value if isinstance(value, list) else [value]):
+                    if isinstance(item, (str, int, bool)):
+                        masks.setdefault(field, {}).setdefault(
+                            item, np.zeros(len(ids), dtype=bool)
+                        )[row] = True
+
+        return ids, payloads, np.ascontiguousarray(matrix), masks
+
+    def _install(self, built, version):
+        # Swapped in together, so a search never sees half of a reload
+        self._ids, self._payloads, self._matrix, self._masks = built
+
+        self.too_large = False
+        self.version = version
+        self.loaded_at = time.monotonic()
+
+    def load_records(self, records, version=None):
+        """
+        Build the index from scrolled Qdrant records (vectors included).
+        """
+        self._install(self._build(records), version)
+
+    def _mark_too_large(self, version):
+        # Checked again after refresh_seconds, in case the collection shrinks
+        self._ids, self._payloads, self._masks = [], [], {}
+        self._matrix = np.zeros((0, 0), dtype=np.float32)
+        self.too_large = True
+        self.version = version
+        self.loaded_at = time.monotonic()
+
+    def refresh(self, client, version=None) -> bool:
+        """
+        (Re)load from a sync QdrantClient. Returns `ready`.
+        """
+        if client.count(self.collection_name, exact=True).count > self.max_points:
+            self._mark_too_large(version)
+            return False
+
+        records, offset = [], None
+        while True:
+            page, offset = client.scroll(
+                self.collection_name,
+                limit=SCROLL_PAGE_SIZE,
+                offset=offset,
+                with_payload=True,
+                with_vectors=[self.vector_name],
+            )
+            records.extend(page)
+            if offset is None:
+                break
+
+        self.load_records(records, version)
+        return True
+
+    async def refresh_async(self, client, version=None) -> bool:
+        """
+        refresh() for an AsyncQdrantClient.
+        """
+        count = await client.count(self.collection_name, exact=True)
+        if count.count > self.max_points:
+            self._mark_too_large(version)
+            return False
+
+        records, offset = [], None
+        while True:
+            page, offset = await client.scroll(
+                self.collection_name,
+                limit=SCROLL_PAGE_SIZE,
+                offset=offset,
+                with_payload=True,
+                with_vectors=[self.vector_name],
+            )
+            records.extend(page)
+            if offset is None:
+                break
+
+        # Off the event loop, so reloads don't stall other requests
+        built = await asyncio.to_thread(self._build, records)
+        self._install(built, version)
+        return True
+
+    async def ensure_fresh(self, client, version=None) -> bool:
+        """
+        Reload when stale or when `version` changed (one loader at a time).
+        Returns `ready`.
+        """
+        if self.is_fresh(version):
+            return self.ready
+
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+
+        async with self._lock:
+            if not self.is_fresh(version):
+                await self.refresh_async(client, version)
+
+        return self.ready
+
+    # -----------------------------
+    # Search
+    # -----------------------------
+    def _filter_mask(self, spec, fields):
+        mask = None
+
+        for field in fields:
+            value = spec.get(field) if spec else None
+            if not value:
+                continue
+
+            field_mask = self._masks.get(field, {}).get(value)
+            if field_mask is None:
+                return np.zeros(len(self._ids), dtype=bool)
+
+            mask = field_mask if mask is None else mask & field_mask
+
+        return mask
+
+    def scores(self, query_vectors):
+        """
+        Cosine similarity of every query row against every point, as one
+        (n_queries, n_points) matrix product.
+        """
+        queries = np.asarray(query_vectors, dtype=np.float32)
+        queries = queries.reshape(len(queries), -1)
+
+        norms = np.linalg.norm(queries, axis=1, keepdims=True)
+        queries = queries / np.where(norms == 0, 1, norms)
+
+        return queries @ self._matrix.T
+
+    def search(self, query_vectors, limit: int, filters=None, fields=()):
+        """
+        Top-`limit` ScoredPoints per query vector, best first.
+        `filters` is None or one spec per query; only `fields` are applied.
+
+        All queries are scored together in one GEMM and each row's top-k
+        is selected with argpartition, so only k hits per row are sorted.
+        """
+        from qdrant_client.models import ScoredPoint
+
+        n_queries = len(query_vectors)
+        if n_queries == 0:
+            return []
+        if len(self._ids) == 0:
+            return [[] for _ in range(n_queries)]
+
+        scores = self.scores(query_vectors)
+
+        if filters is not None:
+            for row, spec in enumerate(filters):
+                mask = self._filter_mask(spec, fields)
+                if mask is not None:
+                    scores[row, ~mask] = -np.inf
+
+        k = min(limit, scores.shape[1])
+        if k <= 0:
+            return [[] for _ in range(n_queries)]
+
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        top_scores = np.take_along_axis(scores, top, axis=1)
+        order = np.argsort(-top_scores, axis=1, kind="stable")
+        top = np.take_along_axis(top, order, axis=1)
+        top_scores = np.take_along_axis(top_scores, order, axis=1)
+
+        return [
+            [
+                ScoredPoint(
+                    id=self._ids[i],
+                    version=0,
+                    score=float(score),
+                    payload=self._payloads[i],
+                )
+                for i, score in zip(row_top, row_scores)
+                if score != -np.inf  # filtered out
+            ]
+            for row_top, row_scores in zip(top.tolist(), top_scores.tolist())
+        ]
+
+# ============================================================
+# Validation (in-memory Qdrant, no server needed)
+# ============================================================
+
+if __name__ == "__main__":
+    from qdrant_client import QdrantClient
+    from qdrant_client.models import Distance, PointStruct, VectorParams
+
+    from evidence_retrieval import FACT_COLLECTION, FACT_VECTOR_NAME
+
+    test_client = QdrantClient(":memory:")
+    test_client.create_collection(
+        collection_name=FACT_COLLECTION,
+        vectors_config={FACT_VECTOR_NAME: VectorParams(size=3, distance=Distance.COSINE)}
+    )
+    test_client.upsert(
+        collection_name=FACT_COLLECTION,
+        points=[
+            PointStruct(id=1, vector={FACT_VECTOR_NAME: [1, 0.1, 0]},
+                        payload={"fact_text": "Vaccines do not cause autism.", "domain": "vaccination"}),
+            PointStruct(id=2, vector={FACT_VECTOR_NAME: [0, 1, 0.1]},
+                        payload={"fact_text": "Turmeric does not cure diabetes.", "domain": "nutrition"}),
+            PointStruct(id=3, vector={FACT_VECTOR_NAME: [0.7, 0.7, 0]},
+                        payload={"fact_text": "Vitamin C does not cure colds.", "domain": "nutrition"}),
+        ]
+    )
+
+    queries = [[0.9, 0.1, 0.0], [0.1, 0.9, 0.0]]
+    fields = FILTER_FIELDS[FACT_COLLECTION]
+
+    index = LocalVectorIndex(FACT_COLLECTION, FACT_VECTOR_NAME)
+    loaded = index.refresh(test_client, version="1")
+
+    local = index.search(queries, limit=2)
+    remote = [
+        test_client.query_points(
+            FACT_COLLECTION, query=q, using=FACT_VECTOR_NAME, limit=2
+        ).points
+        for q in queries
+    ]
+    filtered = index.search(
+        queries, limit=2,
+        filters=[{"domain": "nutrition"}, {"domain": "disease"}], fields=fields
+    )
+
+    # Batched GEMM + argpartition vs one Qdrant query per claim
+    rng = np.random.default_rng(0)
+    test_client.create_collection(
+        collection_name="random",
+        vectors_config={"v": VectorParams(size=16, distance=Distance.COSINE)}
+    )
+    test_client.upsert(
+        collection_name="random",
+        points=[
+            PointStruct(id=i, vector={"v": vector.tolist()}, payload={"domain": str(i % 3)})
+            for i, vector in enumerate(rng.normal(size=(300, 16)))
+        ]
+    )
+    random_queries = rng.normal(size=(20, 16)).astype(np.float32)
+
+    random_index = LocalVectorIndex("random", "v")
+    random_index.refresh(test_client)
+    batched = random_index.search(random_queries, limit=5)
+    per_claim = [
+        test_client.query_points("random", query=q.tolist(), using="v", limit=5).points
+        for q in random_queries
+    ]
+
+    small = LocalVectorIndex(FACT_COLLECTION, FACT_VECTOR_NAME, max_points=2)
+    small.refresh(test_client)
+
+    test_client.create_collection(
+        collection_name="empty",
+        vectors_config={"v": VectorParams(size=3, distance=Distance.COSINE)}
+    )
+    empty = LocalVectorIndex("empty", "v")
+    empty_loaded = empty.refresh(test_client)
+
+    print("\n=== LOCAL INDEX VALIDATION ===\n")
+
+    checks = [
+        (loaded and index.ready, True),
+        (len(index), 3),
+        ([[p.id for p in row] for row in local], [[p.id for p in row] for row in remote]),
+        (all(abs(a.score - b.score) < 1e-5
+             for la, ra in zip(local, remote) for a, b in zip(la, ra)), True),
+        (local[0][0].payload["fact_text"], "Vaccines do not cause autism."),
+        ([p.id for p in filtered[0]], [3, 2]),
+        (filtered[1], []),
+        (index.is_fresh("1"), True),
+        (index.is_fresh("2"), False),
+        (small.ready, False),
+        ([[p.id for p in row] for row in batched], [[p.id for p in row] for row in per_claim]),
+        (index.search([], limit=2), []),
+        (empty_loaded and empty.ready, True),
+        (empty.search(queries, limit=2, filters=[{"domain": "nutrition"}, None], fields=fields),
+         [[], []]),
+    ]
+
+    for i, (output, expected) in enumerate(checks, start=1):
+        status = "✅ PASS" if output == expected else "❌ FAIL"
+        print(f"Check {i}: expected={expected} output={output} {status}")
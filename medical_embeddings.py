@@ -0,0 +1,97 @@
+import threading
+
+import numpy as np
+
+# ============================================================
+# Config
+# ============================================================
+
+MEDICAL_MODEL_NAME = "pritamdeka/BioBERT-mnli-snli-scinli-scitail-mednli-stsb"
+
+MEDICAL_BATCH_SIZE = 32
+
+# ============================================================
+# Model (loaded lazily, on first use)
+# ============================================================
+
+_tokenizer = None
+_model = None
+_device = None
+_load_lock = threading.Lock()
+
+
+def get_medical_model():
+    """
+    Shared (tokenizer, model, device) for the medical-domain encoder.
+    """
+    global _tokenizer, _model, _device
+
+    if _model is None:
+        with _load_lock:
+            if _model is None:
+                import torch
+                from transformers import AutoTokenizer, AutoModel
+
+                _device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+                _tokenizer = AutoTokenizer.from_pretrained(MEDICAL_MODEL_NAME)
+
+                model = AutoModel.from_pretrained(MEDICAL_MODEL_NAME)
+                model.to(_device)
+                model.eval()
+                _model = model
+
+    return _tokenizer, _model, _device
+
+# ============================================================
+# Embedding
+# ============================================================
+
+def embed_medical_batch(texts, batch_size: int = MEDICAL_BATCH_SIZE):
+    """
+    Medical-context embeddings for many texts.
+
+    - texts are tokenized once, then batched shortest-first so each batch
+      pads only to its own longest member
+    - mean pooling skips padding positions (attention-mask aware)
+    - runs under torch.inference_mode
+
+    Returns a contiguous float32 matrix with one row per input, in input order.
+    """
+    import torch
+
+    tokenizer, model, device = get_medical_model()
+    texts = list(texts)
+
+    hidden_size = model.config.hidden_size
+    if not texts:
+        return np.zeros((0, hidden_size), dtype=np.float32)
+
+    encodings = tokenizer(texts, truncation=True)["input_ids"]
+    order = sorted(range(len(texts)), key=lambda i: len(encodings[i]))
+
+    output = np.empty((len(texts), hidden_size), dtype=np.float32)
+
+    with torch.inference_mode():
+        for start in range(0, len(order), batch_size):
+            batch_idx = order[start:start + batch_size]
+
+            inputs = tokenizer.pad(
+                {"input_ids": [encodings[i] for i in batch_idx]},
+                return_tensors="pt"
+            )
+            inputs = {k: v.to(device) for k, v in inputs.items()}
+
+            hidden = model(**inputs).last_hidden_state
+            mask = inputs["attention_mask"].unsqueeze(-1).to(hidden.dtype)
+
+            pooled = (hidden * mask).sum(dim=1) / mask.sum(dim=1).clamp(min=1e-9)
+            output[batch_idx] = pooled.float().cpu().numpy()
+
+    return output
+
+
+def embed_medical(text: str):
+    """
+    Single-text convenience wrapper: a (1, hidden) float32 matrix.
+    """
+    return embed_medical_batch([text])
@@ -0,0 +1,265 @@
+import json
+import logging
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter
+
+# ============================================================
+# Config
+# ============================================================
+
+# Turn off to make every timer/record call a no-op
+METRICS_ENABLED = True
+
+# One structured (JSON) log line per request on the "verifacts" logger
+REQUEST_LOG = False
+
+STAGES = ("decompose", "embed", "search_misinfo", "search_fact", "llm")
+
+# Seconds: spaCy/encoder/Qdrant stages sit in the ms range, Mistral in seconds
+LATENCY_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+    1.0, 2.5, 5.0, 10.0, 30.0, 60.0,
+)
+CLAIM_COUNT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21)
+
+logger = logging.getLogger("verifacts")
+
+# ============================================================
+# Claim path accounting
+# ============================================================
+
+# Every answered claim takes exactly one of these paths ("inflight": reused
+# the LLM call of the same claim in a concurrent request)
+CLAIM_PATHS = ("verdict_cache", "semantic_cache", "fast_path", "llm", "inflight")
+
+
+class PathCounter:
+    """
+    Thread-safe count of how many claims took each answer path.
+    """
+
+    def __init__(self):
+        self._counts = Counter()
+        self._lock = threading.Lock()
+
+    def record(self, path: str, n: int = 1):
+        if n:
+            with self._lock:
+                self._counts[path] += n
+
+    def counts(self):
+        with self._lock:
+            return {path: self._counts[path] for path in CLAIM_PATHS}
+
+    def shares(self):
+        counts = self.counts()
+        total = sum(counts.values())
+        return {
+            path: (count / total if total else 0.0)
+            for path, count in counts.items()
+        }
+
+# ============================================================
+# Histograms + stage timers
+# ============================================================
+
+class Histogram:
+    """
+    Fixed-bucket histogram (Prometheus semantics: `le` upper bounds).
+    """
+
+    def __init__(self, buckets):
+        self.buckets = tuple(buckets)
+        self._counts = [0] * (len(self.buckets) + 1)  # last one is +Inf
+        self._sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+
+    def snapshot(self):
+        """
+        (cumulative counts per bucket incl. +Inf, sum, count)
+        """
+        with self._lock:
+            counts = list(self._counts)
+            total = self._sum
+
+        cumulative = []
+        running = 0
+        for count in counts:
+            running += count
+            cumulative.append(running)
+
+        return cumulative, total, running
+
+
+class _NoopTimer:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NOOP_TIMER = _NoopTimer()
+
+
+class _StageTimer:
+    __slots__ = ("metrics", "stage", "trace", "start")
+
+    def __init__(self, metrics, stage, trace):
+        self.metrics = metrics
+        self.stage = stage
+        self.trace = trace
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.metrics.observe(self.stage, time.perf_counter() - self.start, self.trace)
+        return False
+
+
+class PipelineMetrics:
+    """
+    Per-stage latency histograms, claims per request and LLM token counts.
+
+    A request can carry a trace (see new_trace()) that accumulates its own
+    stage times for the structured request log. When disabled, timer()
+    returns a shared no-op context manager and nothing is recorded.
+    """
+
+    def __init__(self, enabled: bool = METRICS_ENABLED, request_log: bool = REQUEST_LOG):
+        self.enabled = enabled
+        self.request_log = request_log
+
+        self.stage_seconds = {stage: Histogram(LATENCY_BUCKETS) for stage in STAGES}
+        self.claims_per_request = Histogram(CLAIM_COUNT_BUCKETS)
+
+        self._tokens = Counter()
+        self._lock = threading.Lock()
+
+    # -----------------------------
+    # Recording
+    # -----------------------------
+    def new_trace(self):
+        if not (self.enabled and self.request_log):
+            return None
+        return {"start": time.perf_counter(), "stages": Counter(), "tokens": Counter()}
+
+    def timer(self, stage: str, trace=None):
+        if not self.enabled:
+            return _NOOP_TIMER
+        return _StageTimer(self, stage, trace)
+
+    def observe(self, stage: str, seconds: float, trace=None):
+        if not self.enabled:
+            return
+        self.stage_seconds[stage].observe(seconds)
+        if trace is not None:
+            trace["stages"][stage] += seconds
+
+    def record_tokens(self, prompt_tokens, completion_tokens, trace=None):
+        if not self.enabled:
+            return
+        tokens = {"prompt": prompt_tokens or 0, "completion": completion_tokens or 0}
+        with self._lock:
+            self._tokens.update(tokens)
+        if trace is not None:
+            trace["tokens"].update(tokens)
+
+    def record_requests(self, claim_counts, trace=None, paths=None):
+        """
+        Count finished requests (one claim count each). When `trace` is set,
+        emits one log line per request, with its claims' paths (`paths`:
+        one list per request, in claim order). Requests answered together
+        in a server batch share the trace, so stage times and tokens are
+        those of the whole batch ("batch_size" requests).
+        """
+        if not self.enabled:
+            return
+        for n_claims in claim_counts:
+            self.claims_per_request.observe(n_claims)
+
+        if trace is None:
+            return
+
+        shared = {
+            "batch_size": len(claim_counts),
+            "total_ms": round((time.perf_counter() - trace["start"]) * 1000, 2),
+            "stages_ms": {
+                stage: round(seconds * 1000, 2)
+                for stage, seconds in trace["stages"].items()
+            },
+            "tokens": dict(trace["tokens"]),
+        }
+        if paths is None:
+            paths = [[] for _ in claim_counts]
+
+        for n_claims, request_paths in zip(claim_counts, paths):
+            logger.info(json.dumps({
+                "event": "verifacts_request",
+                "claims": n_claims,
+                "paths": list(request_paths),
+                **shared,
+            }))
+
+    def tokens(self):
+        with self._lock:
+            return {"prompt": self._tokens["prompt"], "completion": self._tokens["completion"]}
+
+    # -----------------------------
+    # Prometheus text exposition
+    # -----------------------------
+    def prometheus_text(self, path_counts=None) -> str:
+        lines = [
+            "# HELP verifacts_stage_seconds Pipeline stage latency.",
+            "# TYPE verifacts_stage_seconds histogram",
+        ]
+        for stage, histogram in self.stage_seconds.items():
+            lines += _histogram_lines("verifacts_stage_seconds", histogram, f'stage="{stage}"')
+
+        lines += [
+            "# HELP verifacts_claims_per_request Atomic claims per request.",
+            "# TYPE verifacts_claims_per_request histogram",
+        ]
+        lines += _histogram_lines("verifacts_claims_per_request", self.claims_per_request)
+
+        lines += [
+            "# HELP verifacts_llm_tokens_total LLM tokens reported by Ollama.",
+            "# TYPE verifacts_llm_tokens_total counter",
+        ]
+        for kind, count in self.tokens().items():
+            lines.append(f'verifacts_llm_tokens_total{{kind="{kind}"}} {count}')
+
+        if path_counts is not None:
+            lines += [
+                "# HELP verifacts_claims_total Answered claims by path.",
+                "# TYPE verifacts_claims_total counter",
+            ]
+            for path, count in path_counts.items():
+                lines.append(f'verifacts_claims_total{{path="{path}"}} {count}')
+
+        return "\n".join(lines) + "\n"
+
+
+def _histogram_lines(name: str, histogram: Histogram, labels: str = ""):
+    cumulative, total, count = histogram.snapshot()
+    prefix = f"{labels}," if labels else ""
+    suffix = f"{{{labels}}}" if labels else ""
+
+    lines = [
+        f'{name}_bucket{{{prefix}le="{bound}"}} {value}'
+        for bound, value in zip(histogram.buckets, cumulative)
+    ]
+    lines.append(f'{name}_bucket{{{prefix}le="+Inf"}} {cumulative[-1]}')
+    lines.append(f"{name}_sum{suffix} {total}")
+    lines.append(f"{name}_count{suffix} {count}")
+    return lines
@@ -1,12 +1,15 @@
 from qdrant_client import QdrantClient
-from qdrant_client.models import VectorParams, Distance, PointStruct
+from qdrant_client.models import PointStruct
 from sentence_transformers import SentenceTransformer
+from embedding_store import EmbeddingStore
+from qdrant_setup import provision_collection
 
 # -----------------------------
 # Config
 # -----------------------------
 COLLECTION_NAME = "health_fact_base"
 VECTOR_SIZE = 768
+MODEL_NAME = "sentence-transformers/paraphrase-multilingual-mpnet-base-v2"
 
 # -----------------------------
 # Connect to Qdrant
@@ -15,24 +18,23 @@ client = QdrantClient(url="http://localhost:6333")
 
 # -----------------------------
 # Create collection if needed
+# (run qdrant_setup.py --collection health_fact_base to tune storage)
 # -----------------------------
 if not client.collection_exists(COLLECTION_NAME):
-    client.create_collection(
-        collection_name=COLLECTION_NAME,
-        vectors_config={
-            "fact_embedding": VectorParams(
-                size=VECTOR_SIZE,
-                distance=Distance.COSINE
-            )
-        }
+    provision_collection(
+        client,
+        COLLECTION_NAME,
+        vector_names=["fact_embedding"],
+        vector_size=VECTOR_SIZE
     )
 
 # -----------------------------
 # Load embedding model
 # -----------------------------
-model = SentenceTransformer(
-    "sentence-transformers/paraphrase-multilingual-mpnet-base-v2"
-)
+model = SentenceTransformer(MODEL_NAME)
+
+# Vectors from earlier runs are reused instead of re-encoded
+store = EmbeddingStore(MODEL_NAME)
 
 # -----------------------------
 # Seed verified facts (MVP)
@@ -59,14 +61,14 @@ FACTS = [
 # -----------------------------
 # Embed + upload
 # -----------------------------
-points = []
+vectors = store.encode([fact["text"] for fact in FACTS], model.encode)
 
-for fact in FACTS:
-    vector = model.encode(fact["text"]).tolist()
+points = []
 
+for fact, vector in zip(FACTS, vectors):
     point = PointStruct(
         id=fact["id"],
-        vector={"fact_embedding": vector},
+        vector={"fact_embedding": vector.tolist()},
         payload={
             "fact_text": fact["text"],
             "domain": fact["domain"],
@@ -1,12 +1,14 @@
 from qdrant_client import QdrantClient
 from qdrant_client.models import VectorParams, Distance, PointStruct
 from sentence_transformers import SentenceTransformer
+from embedding_store import EmbeddingStore
 
 # -----------------------------
 # Config
 # -----------------------------
 COLLECTION_NAME = "health_claim_memory"
 VECTOR_SIZE = 768
+MODEL_NAME = "sentence-transformers/paraphrase-multilingual-mpnet-base-v2"
 
 # -----------------------------
 # Connect to Qdrant
@@ -29,9 +31,10 @@ client.recreate_collection(
 # -----------------------------
 # Load embedding model
 # -----------------------------
-model = SentenceTransformer(
-    "sentence-transformers/paraphrase-multilingual-mpnet-base-v2"
-)
+model = SentenceTransformer(MODEL_NAME)
+
+# Vectors from earlier runs are reused instead of re-encoded
+store = EmbeddingStore(MODEL_NAME)
 
 # -----------------------------
 # Seed misinformation narratives
@@ -66,14 +69,17 @@ MISINFO_CLAIMS = [
 # -----------------------------
 # Embed + upload
 # -----------------------------
-points = []
+vectors = store.encode(
+    [item["claim"] for item in MISINFO_CLAIMS],
+    model.encode
+)
 
-for item in MISINFO_CLAIMS:
-    vector = model.encode(item["claim"]).tolist()
+points = []
 
+for item, vector in zip(MISINFO_CLAIMS, vectors):
     point = PointStruct(
         id=item["id"],
-        vector={"claim_embedding": vector},
+        vector={"claim_embedding": vector.tolist()},
         payload={
             "claim_text": item["claim"],
             "domain": item["domain"],
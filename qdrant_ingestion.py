@@ -1,43 +1,23 @@
 from qdrant_client import QdrantClient
 from qdrant_client.models import PointStruct
 from sentence_transformers import SentenceTransformer
-from transformers import AutoTokenizer, AutoModel
-import torch
-import numpy as np
 from datetime import datetime
-
-# -----------------------------
-# Device setup
-# -----------------------------
-device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+from embedding_store import EmbeddingStore
+from medical_embeddings import MEDICAL_MODEL_NAME, embed_medical_batch
 
 # -----------------------------
 # Load embedding models
 # -----------------------------
-claim_model = SentenceTransformer(
-    "sentence-transformers/paraphrase-multilingual-mpnet-base-v2"
-)
+claim_model_name = "sentence-transformers/paraphrase-multilingual-mpnet-base-v2"
+claim_model = SentenceTransformer(claim_model_name)
 
-medical_model_name = "pritamdeka/BioBERT-mnli-snli-scinli-scitail-mednli-stsb"
-medical_tokenizer = AutoTokenizer.from_pretrained(medical_model_name)
-medical_model = AutoModel.from_pretrained(medical_model_name)
-medical_model.to(device)
-medical_model.eval()
+# The medical-domain model (BioBERT) loads on first embed_medical_batch call
 
 # -----------------------------
-# Embedding function
+# Embedding stores (reuse vectors from earlier runs)
 # -----------------------------
-def embed_medical(text: str):
-    inputs = medical_tokenizer(
-        text,
-        return_tensors="pt",
-        truncation=True,
-        padding=True
-    )
-    inputs = {k: v.to(device) for k, v in inputs.items()}
-    with torch.no_grad():
-        outputs = medical_model(**inputs)
-    return outputs.last_hidden_state.mean(dim=1).cpu().numpy()
+claim_store = EmbeddingStore(claim_model_name)
+medical_store = EmbeddingStore(MEDICAL_MODEL_NAME)
 
 # -----------------------------
 # Connect to Qdrant
@@ -90,17 +70,21 @@ claims = [
 # -----------------------------
 # Build Qdrant points
 # -----------------------------
-points = []
+texts = [claim["text"] for claim in claims]
 
-for claim in claims:
-    claim_embedding = claim_model.encode(claim["text"])
-    medical_embedding = embed_medical(claim["text"])
+claim_embeddings = claim_store.encode(texts, claim_model.encode)
+medical_embeddings = medical_store.encode(texts, embed_medical_batch)
+
+points = []
 
+for claim, claim_embedding, medical_embedding in zip(
+    claims, claim_embeddings, medical_embeddings
+):
     point = PointStruct(
         id=claim["id"],
         vector={
-            "claim_text_embedding": claim_embedding,
-            "medical_context_embedding": medical_embedding[0]
+            "claim_text_embedding": claim_embedding.tolist(),
+            "medical_context_embedding": medical_embedding.tolist()
         },
         payload={
             "claim_text": claim["text"],
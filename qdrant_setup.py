@@ -1,26 +1,311 @@
-from qdrant_client import QdrantClient
-from qdrant_client.models import VectorParams, Distance
+import argparse
+import time
 
-# Connect to local Qdrant
-client = QdrantClient(
-    url="http://localhost:6333"
+import numpy as np
+from qdrant_client import QdrantClient
+from qdrant_client.models import (
+    VectorParams,
+    VectorParamsDiff,
+    Distance,
+    HnswConfigDiff,
+    ScalarQuantization,
+    ScalarQuantizationConfig,
+    ScalarType,
+    BinaryQuantization,
+    BinaryQuantizationConfig,
+    Disabled,
+    PayloadSchemaType,
+    PointStruct,
+    SearchParams,
+    QuantizationSearchParams,
 )
 
-COLLECTION_NAME = "health_claim_memory"
-
-# Recreate collection (safe during development)
-client.recreate_collection(
-    collection_name=COLLECTION_NAME,
-    vectors_config={
-        "claim_text_embedding": VectorParams(
-            size=768,
-            distance=Distance.COSINE
-        ),
-        "medical_context_embedding": VectorParams(
-            size=768,
-            distance=Distance.COSINE
-        ),
-    }
-)
+# ============================================================
+# Config
+# ============================================================
+
+QDRANT_URL = "http://localhost:6333"
+
+VECTOR_SIZE = 768
+
+# Collection -> named vectors (all 768-d cosine)
+COLLECTIONS = {
+    "health_claim_memory": ["claim_text_embedding", "medical_context_embedding"],
+    "health_fact_base": ["fact_embedding"],
+}
+
+# Collection -> payload fields searched with filters (keyword indexes)
+PAYLOAD_INDEXES = {
+    "health_claim_memory": ["language", "domain", "verdict"],
+    "health_fact_base": ["domain"],
+}
+
+QUANTIZATION_KINDS = ("none", "scalar", "binary")
+
+# Qdrant defaults
+DEFAULT_HNSW_M = 16
+DEFAULT_EF_CONSTRUCT = 100
+
+# ============================================================
+# Collection provisioning
+# ============================================================
+
+def quantization_config(kind: str):
+    """
+    Quantized copies are kept in RAM; with on-disk originals they are the
+    only vectors that need to stay resident. Search rescoring against the
+    originals is requested at query time (see search_params()).
+    """
+    if kind == "none":
+        return None
+    if kind == "scalar":
+        return ScalarQuantization(
+            scalar=ScalarQuantizationConfig(
+                type=ScalarType.INT8,
+                quantile=0.99,
+                always_ram=True
+            )
+        )
+    if kind == "binary":
+        return BinaryQuantization(
+            binary=BinaryQuantizationConfig(always_ram=True)
+        )
+    raise ValueError(f"Unknown quantization {kind!r}, expected one of {QUANTIZATION_KINDS}")
+
+
+def search_params(hnsw_ef=None, rescore: bool = True, oversampling: float = 2.0):
+    """
+    Query-time parameters matching a quantized collection: oversample the
+    quantized candidates, then rescore them with the original vectors.
+    Harmless on collections without quantization.
+    """
+    return SearchParams(
+        hnsw_ef=hnsw_ef,
+        quantization=QuantizationSearchParams(
+            rescore=rescore,
+            oversampling=oversampling
+        )
+    )
+
+
+def create_payload_indexes(client: QdrantClient, collection_name: str, fields=None):
+    """
+    Keyword indexes for filtered search (creating an existing index is a no-op).
+    """
+    for field in fields if fields is not None else PAYLOAD_INDEXES.get(collection_name, []):
+        client.create_payload_index(
+            collection_name=collection_name,
+            field_name=field,
+            field_schema=PayloadSchemaType.KEYWORD,
+        )
+
+
+def provision_collection(
+    client: QdrantClient,
+    collection_name: str,
+    vector_names=None,
+    quantization: str = "none",
+    on_disk: bool = False,
+    hnsw_m: int = DEFAULT_HNSW_M,
+    ef_construct: int = DEFAULT_EF_CONSTRUCT,
+    recreate: bool = False,
+    vector_size: int = VECTOR_SIZE,
+):
+    """
+    Create `collection_name`, or apply the storage settings in place when
+    it already exists (unless `recreate`, which drops it first).
+    Keyword payload indexes are ensured in both cases.
+    """
+    vector_names = vector_names or COLLECTIONS[collection_name]
+    hnsw_config = HnswConfigDiff(m=hnsw_m, ef_construct=ef_construct)
+
+    if recreate and client.collection_exists(collection_name):
+        client.delete_collection(collection_name)
+
+    if not client.collection_exists(collection_name):
+        client.create_collection(
+            collection_name=collection_name,
+            vectors_config={
+                name: VectorParams(
+                    size=vector_size,
+                    distance=Distance.COSINE,
+                    on_disk=on_disk
+                )
+                for name in vector_names
+            },
+            hnsw_config=hnsw_config,
+            quantization_config=quantization_config(quantization),
+        )
+        create_payload_indexes(client, collection_name)
+        return "created"
+
+    client.update_collection(
+        collection_name=collection_name,
+        vectors_config={name: VectorParamsDiff(on_disk=on_disk) for name in vector_names},
+        hnsw_config=hnsw_config,
+        quantization_config=quantization_config(quantization) or Disabled.DISABLED,
+    )
+    create_payload_indexes(client, collection_name)
+    return "updated"
+
+# ============================================================
+# Recall vs latency report
+# ============================================================
+
+def _synthetic_vectors(n_points: int, n_queries: int, dim: int, seed: int = 0):
+    """
+    Clustered unit vectors (roughly like sentence embeddings of related
+    claims) plus queries that are noisy copies of random points.
+    """
+    rng = np.random.default_rng(seed)
+
+    centers = rng.normal(size=(max(n_points // 50, 1), dim))
+    points = centers[rng.integers(len(centers), size=n_points)]
+    points = points + 0.5 * rng.normal(size=points.shape)
+    points /= np.linalg.norm(points, axis=1, keepdims=True)
+
+    queries = points[rng.integers(n_points, size=n_queries)]
+    queries = queries + 0.2 * rng.normal(size=queries.shape)
+    queries /= np.linalg.norm(queries, axis=1, keepdims=True)
+
+    return points.astype(np.float32), queries.astype(np.float32)
+
+
+def recall_latency_report(
+    client: QdrantClient,
+    n_points: int = 5_000,
+    n_queries: int = 100,
+    top_k: int = 10,
+    hnsw_m: int = DEFAULT_HNSW_M,
+    ef_construct: int = DEFAULT_EF_CONSTRUCT,
+):
+    """
+    Recall@k (against exact numpy search) and per-query latency for each
+    quantization setting, with and without rescoring.
+    """
+    collection_name = "verifacts_quantization_report"
+    vector_name = "v"
+
+    points, queries = _synthetic_vectors(n_points, n_queries, VECTOR_SIZE)
+    truth = np.argsort(-(queries @ points.T), axis=1)[:, :top_k]
+
+    rows = []
+
+    for kind in QUANTIZATION_KINDS:
+        provision_collection(
+            client,
+            collection_name,
+            vector_names=[vector_name],
+            quantization=kind,
+            on_disk=kind != "none",
+            hnsw_m=hnsw_m,
+            ef_construct=ef_construct,
+            recreate=True,
+        )
+        client.upload_points(
+            collection_name=collection_name,
+            points=(
+                PointStruct(id=i, vector={vector_name: vector.tolist()})
+                for i, vector in enumerate(points)
+            ),
+            batch_size=256,
+            wait=True,
+        )
+
+        for rescore in ((False, True) if kind != "none" else (True,)):
+            params = search_params(rescore=rescore)
+
+            latencies = []
+            hits = 0
+            for query, expected in zip(queries, truth):
+                start = time.perf_counter()
+                result = client.query_points(
+                    collection_name=collection_name,
+                    query=query.tolist(),
+                    using=vector_name,
+                    limit=top_k,
+                    search_params=params,
+                ).points
+                latencies.append((time.perf_counter() - start) * 1000)
+
+                hits += len({p.id for p in result} & set(expected.tolist()))
+
+            rows.append({
+                "quantization": kind,
+                "rescore": rescore,
+                "recall": hits / (n_queries * top_k),
+                "p50_ms": float(np.percentile(latencies, 50)),
+                "p95_ms": float(np.percentile(latencies, 95)),
+            })
+
+    client.delete_collection(collection_name)
+    return rows
+
+# ============================================================
+# CLI
+# ============================================================
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Provision VeriFacts Qdrant collections."
+    )
+    parser.add_argument("--url", default=QDRANT_URL,
+                        help="Qdrant URL, or ':memory:' for an in-process instance")
+    parser.add_argument("--collection", choices=[*COLLECTIONS, "all"],
+                        default="health_claim_memory")
+    parser.add_argument("--quantization", choices=QUANTIZATION_KINDS, default="none")
+    parser.add_argument("--on-disk", action="store_true",
+                        help="keep original vectors on disk (mmap)")
+    parser.add_argument("--hnsw-m", type=int, default=DEFAULT_HNSW_M)
+    parser.add_argument("--ef-construct", type=int, default=DEFAULT_EF_CONSTRUCT)
+    parser.add_argument("--update", action="store_true",
+                        help="apply settings to an existing collection instead of recreating it")
+    parser.add_argument("--report", action="store_true",
+                        help="print a recall-vs-latency report instead of provisioning")
+    parser.add_argument("--report-points", type=int, default=5_000)
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+
+    if args.url == ":memory:":
+        client = QdrantClient(":memory:")
+    else:
+        client = QdrantClient(url=args.url)
+
+    if args.report:
+        if args.url == ":memory:":
+            print("NOTE: in-process Qdrant searches exactly and ignores "
+                  "quantization/HNSW; point --url at a server for real numbers.")
+
+        print(f"\n=== RECALL vs LATENCY ({args.report_points} points, "
+              f"m={args.hnsw_m}, ef_construct={args.ef_construct}) ===\n")
+
+        for row in recall_latency_report(
+            client,
+            n_points=args.report_points,
+            hnsw_m=args.hnsw_m,
+            ef_construct=args.ef_construct,
+        ):
+            print(
+                f"{row['quantization']:>6}  rescore={str(row['rescore']):<5}  "
+                f"recall@10={row['recall']:.3f}  "
+                f"p50={row['p50_ms']:.2f} ms  p95={row['p95_ms']:.2f} ms"
+            )
+    else:
+        names = list(COLLECTIONS) if args.collection == "all" else [args.collection]
 
-print(f"Collection '{COLLECTION_NAME}' created successfully")
+        for name in names:
+            status = provision_collection(
+                client,
+                name,
+                quantization=args.quantization,
+                on_disk=args.on_disk,
+                hnsw_m=args.hnsw_m,
+                ef_construct=args.ef_construct,
+                recreate=not args.update,
+            )
+            print(f"Collection '{name}' {status} successfully "
+                  f"(quantization={args.quantization}, on_disk={args.on_disk}, "
+                  f"m={args.hnsw_m}, ef_construct={args.ef_construct})")
@@ -0,0 +1,366 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+# ============================================================
+# Config
+# ============================================================
+
+DEFAULT_MAX_ENTRIES = 10_000
+DEFAULT_DISK_MAX_ENTRIES = 1_000_000
+
+# SQLite tier: recency updates from get() are written in batches of this
+# size (or with the next set()), not one commit per hit
+DISK_TOUCH_BATCH = 256
+# Share of max_entries evicted beyond the excess, so eviction (and its
+# exact COUNT) does not run on every insert once the table is full
+DISK_EVICT_SLACK = 0.01
+
+# ============================================================
+# Keys
+# ============================================================
+
+def claim_cache_key(claim: str, fact_base_version: str) -> str:
+    """
+    Cache key for one atomic claim.
+    Results are only reusable against the same fact base, so the key
+    carries a hash of the fact-base version next to the lowercased claim.
+    """
+    version_hash = hashlib.sha256(fact_base_version.encode("utf-8")).hexdigest()[:16]
+    return f"{version_hash}:{claim.strip().lower()}"
+
+# ============================================================
+# In-process LRU tier
+# ============================================================
+
+class LRUCache:
+    """
+    Thread-safe in-process LRU with optional TTL (seconds).
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, ttl_seconds=None):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()  # key -> (stored_at, value)
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is None:
+                self.misses += 1
+                return None
+
+            stored_at, value = entry
+            if self.ttl_seconds is not None and time.time() - stored_at > self.ttl_seconds:
+                del self._entries[key]
+                self.evictions += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.time(), value)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "size": len(self._entries),
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+# ============================================================
+# On-disk SQLite tier
+# ============================================================
+
+class SQLiteCache:
+    """
+    JSON-valued key/value store in a SQLite file.
+    Safe to share between threads and between worker processes
+    (SQLite handles the file locking, WAL keeps readers unblocked).
+    Least-recently-accessed rows are evicted beyond `max_entries`.
+
+    Writes stay O(log n): the row count is tracked and eviction only runs
+    once it passes `max_entries`, and access times from hits are flushed
+    in batches rather than committed on every get().
+    """
+
+    def __init__(self, path: str, max_entries: int = DEFAULT_DISK_MAX_ENTRIES, ttl_seconds=None):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+
+        self._touched = {}  # key -> accessed_at, not yet written
+
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            " key TEXT PRIMARY KEY,"
+            " value TEXT NOT NULL,"
+            " stored_at REAL NOT NULL,"
+            " accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS cache_accessed_at ON cache (accessed_at)"
+        )
+        self._conn.commit()
+
+        # Approximate (replacements and other processes' writes are not
+        # tracked): re-counted exactly before evicting
+        self._rows = self._count()
+
+    def _count(self):
+        return self._conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+
+    def _flush_touches(self):
+        # Caller holds self._lock and commits
+        if self._touched:
+            self._conn.executemany(
+                "UPDATE cache SET accessed_at = ? WHERE key = ?",
+                [(accessed_at, key) for key, accessed_at in self._touched.items()]
+            )
+            self._touched.clear()
+
+    def _evict(self):
+        # Caller holds self._lock and commits
+        self._rows = self._count()
+        excess = self._rows - self.max_entries
+        if excess <= 0:
+            return
+
+        excess += int(self.max_entries * DISK_EVICT_SLACK)
+        self._conn.execute(
+            "DELETE FROM cache WHERE key IN ("
+            " SELECT key FROM cache ORDER BY accessed_at ASC LIMIT ?)",
+            (excess,)
+        )
+        self._rows = max(self._rows - excess, 0)
+
+    def get(self, key):
+        now = time.time()
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, stored_at FROM cache WHERE key = ?", (key,)
+            ).fetchone()
+
+            if row is None:
+                self.misses += 1
+                return None
+
+            value, stored_at = row
+            if self.ttl_seconds is not None and now - stored_at > self.ttl_seconds:
+                self._touched.pop(key, None)
+                self._conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+                self._conn.commit()
+                self._rows -= 1
+                self.misses += 1
+                return None
+
+            self._touched[key] = now
+            if len(self._touched) >= DISK_TOUCH_BATCH:
+                self._flush_touches()
+                self._conn.commit()
+            self.hits += 1
+
+        return json.loads(value)
+
+    def set(self, key, value):
+        now = time.time()
+
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, stored_at, accessed_at)"
+                " VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value, ensure_ascii=False), now, now)
+            )
+            self._touched.pop(key, None)
+            self._rows += 1
+
+            if self._rows > self.max_entries:
+                self._flush_touches()  # evict by up-to-date recency
+                self._evict()
+            self._conn.commit()
+
+    def flush(self):
+        """
+        Write pending access times now (e.g. before shutting down).
+        """
+        with self._lock:
+            self._flush_touches()
+            self._conn.commit()
+
+    def clear(self):
+        with self._lock:
+            self._touched.clear()
+            self._conn.execute("DELETE FROM cache")
+            self._conn.commit()
+            self._rows = 0
+
+    def __len__(self):
+        with self._lock:
+            return self._count()
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self),
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+# ============================================================
+# Tiered cache (memory -> disk)
+# ============================================================
+
+class TieredCache:
+    """
+    LRU tier in front of an optional SQLite tier.
+    Disk hits are promoted into memory.
+    """
+
+    def __init__(self, memory: LRUCache, disk: SQLiteCache = None):
+        self.memory = memory
+        self.disk = disk
+
+    def get(self, key):
+        value = self.memory.get(key)
+        if value is not None or self.disk is None:
+            return value
+
+        value = self.disk.get(key)
+        if value is not None:
+            self.memory.set(key, value)
+        return value
+
+    def set(self, key, value):
+        self.memory.set(key, value)
+        if self.disk is not None:
+            self.disk.set(key, value)
+
+    def clear(self):
+        self.memory.clear()
+        if self.disk is not None:
+            self.disk.clear()
+
+    def stats(self):
+        memory = self.memory.stats()
+        disk = self.disk.stats() if self.disk is not None else None
+
+        hits = memory["hits"] + (disk["hits"] if disk else 0)
+        lookups = memory["hits"] + memory["misses"]
+
+        return {
+            "hits": hits,
+            "misses": lookups - hits,
+            "hit_rate": hits / lookups if lookups else 0.0,
+            "memory": memory,
+            "disk": disk,
+        }
+
+
+def build_verdict_cache(
+    max_entries: int = DEFAULT_MAX_ENTRIES,
+    ttl_seconds=None,
+    sqlite_path: str = None,
+    disk_max_entries: int = DEFAULT_DISK_MAX_ENTRIES,
+) -> TieredCache:
+    disk = None
+    if sqlite_path:
+        disk = SQLiteCache(sqlite_path, max_entries=disk_max_entries, ttl_seconds=ttl_seconds)
+
+    return TieredCache(LRUCache(max_entries, ttl_seconds), disk)
+
+# ============================================================
+# Validation Tests
+# ============================================================
+
+if __name__ == "__main__":
+    import os
+    import tempfile
+
+    print("\n=== RESULT CACHE VALIDATION ===\n")
+
+    checks = []
+
+    key = claim_cache_key("  Vaccines Cause Autism ", "v1")
+    checks.append(("key normalizes case", key == claim_cache_key("vaccines cause autism", "v1")))
+    checks.append(("key tracks fact base", key != claim_cache_key("vaccines cause autism", "v2")))
+
+    lru = LRUCache(max_entries=2)
+    lru.set("a", 1)
+    lru.set("b", 2)
+    lru.get("a")
+    lru.set("c", 3)
+    checks.append(("LRU evicts least recent", lru.get("b") is None and lru.get("a") == 1))
+
+    ttl = LRUCache(ttl_seconds=0.01)
+    ttl.set("a", 1)
+    time.sleep(0.02)
+    checks.append(("LRU TTL expiry", ttl.get("a") is None))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "verdicts.sqlite3")
+
+        cache = build_verdict_cache(max_entries=1, sqlite_path=path, disk_max_entries=2)
+        cache.set("a", {"response": "x"})
+        cache.set("b", {"response": "y"})
+        checks.append(("disk tier serves memory evictions", cache.get("a") == {"response": "x"}))
+
+        cache.set("c", {"response": "z"})
+        checks.append(("disk size eviction", len(cache.disk) == 2))
+
+        lru_disk = SQLiteCache(os.path.join(tmp, "lru.sqlite3"), max_entries=2)
+        lru_disk.set("a", 1)
+        lru_disk.set("b", 2)
+        lru_disk.get("a")  # access time still pending, not committed
+        lru_disk.set("c", 3)
+        checks.append(("disk evicts least recently accessed",
+                       lru_disk.get("b") is None and lru_disk.get("a") == 1))
+        lru_disk._conn.close()
+
+        reopened = build_verdict_cache(sqlite_path=path)
+        checks.append(("disk tier persists", reopened.get("c") == {"response": "z"}))
+
+        stats = cache.stats()
+        checks.append(("stats counted", stats["hits"] == 1 and stats["memory"]["misses"] == 1))
+
+        cache.disk._conn.close()
+        reopened.disk._conn.close()
+
+    for i, (name, ok) in enumerate(checks, start=1):
+        print(f"Check {i}: {name}: {'✅ PASS' if ok else '❌ FAIL'}")
@@ -0,0 +1,231 @@
+import threading
+import time
+
+import numpy as np
+
+# ============================================================
+# Config
+# ============================================================
+
+DEFAULT_CAPACITY = 2048
+DEFAULT_THRESHOLD = 0.85  # cosine similarity needed to reuse an answer
+
+# ============================================================
+# Semantic near-duplicate cache
+# ============================================================
+
+class SemanticCache:
+    """
+    Reuses answers for paraphrased claims.
+
+    Claim vectors of recently answered claims live row-normalized in one
+    preallocated float32 matrix, so a lookup for a whole batch of claims
+    is a single matrix product. When the matrix is full, the least
+    recently used row is overwritten.
+
+    Like the verdict cache, rows expire after `ttl_seconds` and only match
+    lookups for the fact-base `version` they were answered against;
+    stale rows are never served and are the first to be overwritten.
+
+    Embeddings barely register negation, so each row also keeps whether
+    its claim was `negated`, and only matches lookups of the same polarity.
+    """
+
+    def __init__(
+        self,
+        dim: int,
+        capacity: int = DEFAULT_CAPACITY,
+        threshold: float = DEFAULT_THRESHOLD,
+        ttl_seconds=None,
+    ):
+        self.dim = dim
+        self.capacity = capacity
+        self.threshold = threshold
+        self.ttl_seconds = ttl_seconds
+
+        self._vectors = np.zeros((capacity, dim), dtype=np.float32)
+        self._last_used = np.zeros(capacity, dtype=np.int64)
+        self._stored_at = np.zeros(capacity, dtype=np.float64)
+        self._negated = np.zeros(capacity, dtype=bool)
+        self._versions = [None] * capacity
+        self._values = [None] * capacity
+        self._size = 0
+        self._clock = 0
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def _normalize(vectors):
+        vectors = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.maximum(norms, 1e-12)
+
+    def _stale_rows(self, version):
+        # Expired rows, and rows answered against another fact base
+        stale = np.array(
+            [row_version != version for row_version in self._versions[:self._size]],
+            dtype=bool
+        )
+        if self.ttl_seconds is not None:
+            stale |= time.time() - self._stored_at[:self._size] > self.ttl_seconds
+        return stale
+
+    def lookup_many(self, vectors, version=None, negated=None):
+        """
+        Returns one (value, similarity) pair per query row,
+        or None where nothing fresh for `version` is above the threshold.
+        `negated` (one bool per query row, default all False) is the
+        polarity a matching row must have.
+        """
+        queries = self._normalize(vectors)
+        negated = self._polarity(negated, len(queries))
+
+        with self._lock:
+            if self._size == 0:
+                self.misses += len(queries)
+                return [None] * len(queries)
+
+            scores = queries @ self._vectors[:self._size].T
+
+            stale = self._stale_rows(version)
+            if stale.any():
+                scores[:, stale] = -np.inf
+                self._last_used[:self._size][stale] = -1  # overwrite these first
+
+            # "X is not Y" must not reuse the answer for "X is Y"
+            scores[negated[:, None] != self._negated[None, :self._size]] = -np.inf
+
+            best = scores.argmax(axis=1)
+
+            matches = []
+            for row, idx in enumerate(best):
+                score = float(scores[row, idx])
+                if score >= self.threshold:
+                    self._clock += 1
+                    self._last_used[idx] = self._clock
+                    self.hits += 1
+                    matches.append((self._values[idx], score))
+                else:
+                    self.misses += 1
+                    matches.append(None)
+
+            return matches
+
+    def lookup(self, vector, version=None, negated=False):
+        return self.lookup_many(vector, version, [negated])[0]
+
+    @staticmethod
+    def _polarity(negated, n):
+        if negated is None:
+            return np.zeros(n, dtype=bool)
+        return np.asarray(negated, dtype=bool).reshape(n)
+
+    def add_many(self, vectors, values, version=None, negated=None):
+        rows = self._normalize(vectors)
+        negated = self._polarity(negated, len(rows))
+        now = time.time()
+
+        with self._lock:
+            for row, value, row_negated in zip(rows, values, negated):
+                if self._size < self.capacity:
+                    idx = self._size
+                    self._size += 1
+                else:
+                    idx = int(self._last_used.argmin())
+                    self.evictions += 1
+
+                self._clock += 1
+                self._vectors[idx] = row
+                self._last_used[idx] = self._clock
+                self._stored_at[idx] = now
+                self._versions[idx] = version
+                self._negated[idx] = row_negated
+                self._values[idx] = value
+
+    def add(self, vector, value, version=None, negated=False):
+        self.add_many([vector], [value], version, [negated])
+
+    def clear(self):
+        with self._lock:
+            self._size = 0
+            self._versions = [None] * self.capacity
+            self._values = [None] * self.capacity
+
+    def __len__(self):
+        return self._size
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "size": self._size,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+# ============================================================
+# Validation Tests
+# ============================================================
+
+if __name__ == "__main__":
+    print("\n=== SEMANTIC CACHE VALIDATION ===\n")
+
+    checks = []
+
+    cache = SemanticCache(dim=3, capacity=2, threshold=0.9)
+    cache.add([1, 0, 0], "a")
+    cache.add([0, 1, 0], "b")
+    checks.append(("near duplicate hits", cache.lookup([0.95, 0.05, 0])[0] == "a"))
+    checks.append(("unrelated vector misses", cache.lookup([0, 0, 1]) is None))
+
+    cache.lookup([0, 1, 0])  # "b" is now most recently used
+    cache.add([0, 0, 1], "c")
+    checks.append(("LRU row evicted", cache.lookup([1, 0, 0]) is None))
+    checks.append(("hit rate tracked", cache.stats()["hit_rate"] == 0.5))
+
+    cache = SemanticCache(dim=3, ttl_seconds=0.01)
+    cache.add([1, 0, 0], "v1 answer", version="1")
+    checks.append(("same fact base hits", cache.lookup([1, 0, 0], version="1") is not None))
+    checks.append(("other fact base misses", cache.lookup([1, 0, 0], version="2") is None))
+    time.sleep(0.02)
+    checks.append(("expired row misses", cache.lookup([1, 0, 0], version="1") is None))
+
+    cache = SemanticCache(dim=3, threshold=0.9)
+    cache.add([1, 0, 0], "claim answer")
+    cache.add([0, 1, 0], "negated claim answer", negated=True)
+    checks.append(("negated query misses a plain row", cache.lookup([1, 0, 0], negated=True) is None))
+    checks.append(("plain query misses a negated row", cache.lookup([0, 1, 0]) is None))
+    checks.append(("same polarity hits",
+                   [m[0] for m in cache.lookup_many([[1, 0, 0], [0, 1, 0]], negated=[False, True])]
+                   == ["claim answer", "negated claim answer"]))
+
+    # Paraphrases through the production encoder
+    from sentence_transformers import SentenceTransformer
+
+    model = SentenceTransformer(
+        "sentence-transformers/paraphrase-multilingual-mpnet-base-v2"
+    )
+
+    cached_claims = ["vaccines cause autism in children", "turmeric cures diabetes"]
+    paraphrases = [
+        ("vaccines make kids autistic", "vaccines cause autism in children"),
+        ("turmeric can cure diabetes", "turmeric cures diabetes"),
+        ("vaccines cause infertility", None),
+    ]
+
+    cache = SemanticCache(dim=model.get_sentence_embedding_dimension())
+    cache.add_many(model.encode(cached_claims), cached_claims)
+
+    queries = [q for q, _ in paraphrases]
+    for (query, expected), match in zip(paraphrases, cache.lookup_many(model.encode(queries))):
+        output = match[0] if match else None
+        score = f"{match[1]:.3f}" if match else "-"
+        checks.append((f"{query!r} -> {output!r} ({score})", output == expected))
+
+    for i, (name, ok) in enumerate(checks, start=1):
+        print(f"Check {i}: {name}: {'✅ PASS' if ok else '❌ FAIL'}")
@@ -1,5 +1,8 @@
-import sys
-from verifacts_pipeline import check_health_claim
+import argparse
+import json
+
+from bulk_verify import NLP_PROCESSES, bulk_verify
+from verifacts_pipeline import LLM_CONCURRENCY, stream_health_claim
 
 EXAMPLE_QUERIES = [
     "Doctors won’t tell you this but vaccines cause autism",
@@ -8,6 +11,37 @@ EXAMPLE_QUERIES = [
 ]
 
 
+def print_streamed_analysis(user_text: str):
+    """
+    Print each claim's analysis as it is produced: LLM tokens appear as
+    they are generated instead of after every claim is finished.
+    """
+    claims = []
+    streaming = None  # index of the claim whose tokens are being printed
+
+    for event in stream_health_claim(user_text):
+        kind = event["event"]
+
+        if kind == "claims":
+            claims = event["claims"]
+            if not claims:
+                print("No clear health-related factual claim detected.")
+                print("\n----------------------\n")
+
+        elif kind == "token":
+            if streaming != event["index"]:
+                streaming = event["index"]
+                print(f"Claim: {claims[streaming]}\n")
+            print(event["content"], end="", flush=True)
+
+        elif kind == "result":
+            if streaming != event["index"]:
+                print(f"Claim: {event['claim']}\n")
+                print(event["response"], end="")
+            streaming = None
+            print("\n\n----------------------\n")
+
+
 def run_example_demo():
     print("\n==============================")
     print(" VeriFacts Health – Instant Demo")
@@ -16,12 +50,7 @@ def run_example_demo():
     for query in EXAMPLE_QUERIES:
         print(f"> {query}\n")
 
-        results = check_health_claim(query)
-
-        for res in results:
-            print(f"Claim: {res['claim']}\n")
-            print(res["response"])
-            print("\n----------------------\n")
+        print_streamed_analysis(query)
 
     print("End of demo.\n")
 
@@ -46,18 +75,55 @@ def interactive_cli():
             print("Please enter a valid claim.\n")
             continue
 
-        results = check_health_claim(user_input)
-
         print("\n--- Analysis Result ---\n")
 
-        for res in results:
-            print(f"Claim: {res['claim']}\n")
-            print(res["response"])
-            print("\n----------------------\n")
+        print_streamed_analysis(user_input)
+
+
+def run_batch(args):
+    summary = bulk_verify(
+        args.input,
+        args.output,
+        text_field=args.text_field,
+        n_process=args.processes,
+        max_concurrency=args.concurrency,
+        resume=not args.restart,
+    )
+
+    print(f"\nWrote {summary['records']} records to {args.output}")
+    print(json.dumps(summary, indent=2))
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="VeriFacts health misinformation checker.")
+    parser.add_argument("--example", action="store_true",
+                        help="run the built-in example queries and exit")
+
+    commands = parser.add_subparsers(dest="command")
+
+    batch = commands.add_parser(
+        "batch", help="verify every record of a JSONL or CSV file (results as JSONL)"
+    )
+    batch.add_argument("input", help=".jsonl (one object per line) or .csv (header row)")
+    batch.add_argument("-o", "--output", default="verifacts_results.jsonl")
+    batch.add_argument("--text-field",
+                       help="key/column holding the message text (default: auto-detect)")
+    batch.add_argument("--processes", type=int, default=NLP_PROCESSES,
+                       help="spaCy worker processes for claim decomposition")
+    batch.add_argument("--concurrency", type=int, default=LLM_CONCURRENCY,
+                       help="max in-flight LLM calls")
+    batch.add_argument("--restart", action="store_true",
+                       help="overwrite the output file instead of skipping the ids already in it")
+
+    return parser.parse_args()
 
 
 if __name__ == "__main__":
-    if "--example" in sys.argv:
+    args = parse_args()
+
+    if args.command == "batch":
+        run_batch(args)
+    elif args.example:
         run_example_demo()
     else:
         interactive_cli()
@@ -0,0 +1,312 @@
+import threading
+
+from pipeline_metrics import PathCounter, PipelineMetrics
+from result_cache import build_verdict_cache
+
+# ============================================================
+# Config
+# ============================================================
+
+QDRANT_URL = "http://localhost:6333"
+
+EMBEDDING_MODEL_NAME = "sentence-transformers/paraphrase-multilingual-mpnet-base-v2"
+
+# On-disk vector cache for the online pipeline (None disables it). Point it
+# at EMBEDDING_STORE_DIR to reuse the vectors the ingestion scripts stored;
+# read-only by default, so user claims never grow that store.
+EMBEDDING_STORE_ROOT = None
+EMBEDDING_STORE_READ_ONLY = True
+
+# Bump whenever health_fact_base is re-ingested: cached verdicts are keyed
+# on it, so older explanations stop being served.
+FACT_BASE_VERSION = "1"
+
+VERDICT_CACHE_SIZE = 10_000
+VERDICT_CACHE_TTL = 24 * 60 * 60  # seconds
+VERDICT_CACHE_PATH = None  # e.g. "verdict_cache.sqlite3" for the disk tier
+
+SEMANTIC_CACHE_SIZE = 2048
+SEMANTIC_CACHE_THRESHOLD = 0.85  # cosine similarity to reuse a paraphrase's answer
+SEMANTIC_CACHE_TTL = VERDICT_CACHE_TTL  # same staleness bound as verdicts
+
+# Search health_fact_base / health_claim_memory in-process when they hold
+# at most LOCAL_INDEX_MAX_POINTS points (see local_index.py)
+LOCAL_INDEX = True
+LOCAL_INDEX_MAX_POINTS = 10_000
+LOCAL_INDEX_REFRESH_SECONDS = 300
+
+# ============================================================
+# Engine
+# ============================================================
+
+class VerifactsEngine:
+    """
+    Owns every heavyweight resource the pipeline needs:
+    spaCy model, sentence encoder, Qdrant clients, LLM client, caches
+    and the on-disk embedding store.
+
+    Nothing is loaded until first use, and construction is thread-safe.
+    Any resource can be injected up front (e.g. lightweight stand-ins
+    in tests), in which case the default is never built.
+    """
+
+    def __init__(
+        self,
+        nlp=None,
+        embedding_model=None,
+        client=None,
+        async_client=None,
+        llm_client=None,
+        verdict_cache=None,
+        semantic_cache=None,
+        embedding_store=None,
+        metrics=None,
+        local_indexes=None,
+        qdrant_url: str = QDRANT_URL,
+        embedding_model_name: str = EMBEDDING_MODEL_NAME,
+        fact_base_version: str = FACT_BASE_VERSION,
+    ):
+        self.qdrant_url = qdrant_url
+        self.embedding_model_name = embedding_model_name
+        self.fact_base_version = fact_base_version
+
+        self._nlp = nlp
+        self._embedding_model = embedding_model
+        self._client = client
+        self._async_client = async_client
+        self._llm_client = llm_client
+        self._verdict_cache = verdict_cache
+        self._semantic_cache = semantic_cache
+        self._embedding_store = embedding_store
+        self._medical_embedding_store = None
+        self._local_indexes = local_indexes
+
+        # Which path (cache / fast path / LLM) each claim took
+        self.path_counter = PathCounter()
+
+        # cache key -> asyncio.Future of an LLM answer being generated, so
+        # concurrent requests with the same claim share one call
+        self.inflight_claims = {}
+
+        # Stage latencies, claims per request, LLM tokens
+        self.metrics = metrics or PipelineMetrics()
+
+        # Re-entrant: building the semantic cache needs the encoder
+        self._lock = threading.RLock()
+
+    def _lazy(self, attr: str, factory):
+        value = getattr(self, attr)
+        if value is None:
+            with self._lock:
+                value = getattr(self, attr)
+                if value is None:
+                    value = factory()
+                    setattr(self, attr, value)
+        return value
+
+    # -----------------------------
+    # Models
+    # -----------------------------
+
+    @property
+    def nlp(self):
+        from claim_decomposer import get_nlp
+        return self._lazy("_nlp", get_nlp)
+
+    @property
+    def embedding_model(self):
+        def load():
+            from sentence_transformers import SentenceTransformer
+            return SentenceTransformer(self.embedding_model_name)
+
+        return self._lazy("_embedding_model", load)
+
+    def embed(self, texts, batch_size: int = 32):
+        """
+        Float32 matrix of claim embeddings, one row per text.
+        Vectors already in the embedding store skip the encoder
+        (which is then not even loaded).
+        """
+        def encode(misses):
+            return self.embedding_model.encode(
+                misses,
+                batch_size=batch_size,
+                convert_to_numpy=True
+            )
+
+        store = self.embedding_store
+        if store is None:
+            return encode(list(texts))
+
+        return store.encode(texts, encode)
+
+    def embed_medical(self, texts):
+        """
+        Float32 matrix of medical-context (BioBERT) embeddings,
+        read through the embedding store like embed().
+        """
+        from medical_embeddings import embed_medical_batch
+
+        store = self.medical_embedding_store
+        if store is None:
+            return embed_medical_batch(list(texts))
+
+        return store.encode(texts, embed_medical_batch)
+
+    # -----------------------------
+    # Clients
+    # -----------------------------
+
+    @property
+    def client(self):
+        def connect():
+            from qdrant_client import QdrantClient
+            return QdrantClient(url=self.qdrant_url)
+
+        return self._lazy("_client", connect)
+
+    @property
+    def async_client(self):
+        def connect():
+            from qdrant_client import AsyncQdrantClient
+            return AsyncQdrantClient(url=self.qdrant_url)
+
+        return self._lazy("_async_client", connect)
+
+    @property
+    def llm_client(self):
+        def connect():
+            import ollama
+            return ollama.AsyncClient()
+
+        return self._lazy("_llm_client", connect)
+
+    # -----------------------------
+    # Caches
+    # -----------------------------
+
+    @property
+    def embedding_store(self):
+        if EMBEDDING_STORE_ROOT is None and self._embedding_store is None:
+            return None
+
+        def open_store():
+            from embedding_store import EmbeddingStore
+            return EmbeddingStore(
+                self.embedding_model_name,
+                root=EMBEDDING_STORE_ROOT,
+                read_only=EMBEDDING_STORE_READ_ONLY
+            )
+
+        return self._lazy("_embedding_store", open_store)
+
+    @property
+    def medical_embedding_store(self):
+        if EMBEDDING_STORE_ROOT is None:
+            return None
+
+        def open_store():
+            from embedding_store import EmbeddingStore
+            from medical_embeddings import MEDICAL_MODEL_NAME
+            return EmbeddingStore(
+                MEDICAL_MODEL_NAME,
+                root=EMBEDDING_STORE_ROOT,
+                read_only=EMBEDDING_STORE_READ_ONLY
+            )
+
+        return self._lazy("_medical_embedding_store", open_store)
+
+    @property
+    def verdict_cache(self):
+        return self._lazy("_verdict_cache", lambda: build_verdict_cache(
+            max_entries=VERDICT_CACHE_SIZE,
+            ttl_seconds=VERDICT_CACHE_TTL,
+            sqlite_path=VERDICT_CACHE_PATH
+        ))
+
+    @property
+    def semantic_cache(self):
+        def build():
+            from semantic_cache import SemanticCache
+
+            # Prefer the stored dimension so a warm store never loads the encoder
+            store = self.embedding_store
+            if store is not None and store.dim:
+                dim = store.dim
+            else:
+                dim = self.embedding_model.get_sentence_embedding_dimension()
+
+            return SemanticCache(
+                dim=dim,
+                capacity=SEMANTIC_CACHE_SIZE,
+                threshold=SEMANTIC_CACHE_THRESHOLD,
+                ttl_seconds=SEMANTIC_CACHE_TTL
+            )
+
+        return self._lazy("_semantic_cache", build)
+
+    # -----------------------------
+    # In-process search
+    # -----------------------------
+
+    @property
+    def local_indexes(self):
+        """
+        {collection: LocalVectorIndex} for collections small enough to be
+        searched in-process. Indexes load (and reload on a fact-base
+        version bump) on first use, see verifacts_pipeline.
+        """
+        def build():
+            if not LOCAL_INDEX:
+                return {}
+
+            from evidence_retrieval import (
+                FACT_COLLECTION,
+                FACT_VECTOR_NAME,
+                MISINFO_COLLECTION,
+                MISINFO_VECTOR_NAME,
+            )
+            from local_index import LocalVectorIndex
+
+            return {
+                collection: LocalVectorIndex(
+                    collection,
+                    vector_name,
+                    max_points=LOCAL_INDEX_MAX_POINTS,
+                    refresh_seconds=LOCAL_INDEX_REFRESH_SECONDS
+                )
+                for collection, vector_name in (
+                    (MISINFO_COLLECTION, MISINFO_VECTOR_NAME),
+                    (FACT_COLLECTION, FACT_VECTOR_NAME),
+                )
+            }
+
+        return self._lazy("_local_indexes", build)
+
+# ============================================================
+# Default engine (process-wide singleton)
+# ============================================================
+
+_default_engine = None
+_default_engine_lock = threading.Lock()
+
+
+def get_engine() -> VerifactsEngine:
+    global _default_engine
+
+    if _default_engine is None:
+        with _default_engine_lock:
+            if _default_engine is None:
+                _default_engine = VerifactsEngine()
+
+    return _default_engine
+
+
+def set_engine(engine: VerifactsEngine):
+    """
+    Replace the process-wide engine (e.g. with injected stand-ins).
+    """
+    global _default_engine
+
+    with _default_engine_lock:
+        _default_engine = engine
@@ -1,91 +1,69 @@
-from claim_decomposer import extract_atomic_claims
-from sentence_transformers import SentenceTransformer
-from qdrant_client import QdrantClient
-import ollama
+import asyncio
+import queue
+import threading
 
-# ============================================================
-# Config
-# ============================================================
-
-MISINFO_COLLECTION = "health_claim_memory"
-FACT_COLLECTION = "health_fact_base"
+from claim_context import claim_filters
+from claim_decomposer import extract_atomic_claims, extract_atomic_claims_batch
+from evidence_retrieval import MISINFO_COLLECTION, retrieve_evidence_async
+from result_cache import claim_cache_key
+from verifacts_engine import VerifactsEngine, get_engine
 
-MISINFO_VECTOR_NAME = "claim_text_embedding"
-FACT_VECTOR_NAME = "fact_embedding"
+# Models, clients and caches live on a VerifactsEngine and are loaded on
+# first use, so importing this module is cheap.
 
 # ============================================================
-# Initialize clients
+# Config
 # ============================================================
 
-client = QdrantClient(url="http://localhost:6333")
+EMBED_BATCH_SIZE = 32
 
-embedding_model = SentenceTransformer(
-    "sentence-transformers/paraphrase-multilingual-mpnet-base-v2"
-)
+LLM_MODEL = "mistral"
+LLM_CONCURRENCY = 4  # max in-flight ollama.chat calls per request
 
-# ============================================================
-# Core pipeline
-# ============================================================
+# "single": claim_text_embedding only. "hybrid": also search
+# medical_context_embedding (BioBERT) and fuse both rankings in Qdrant.
+RETRIEVAL_MODE = "single"
 
-def check_health_claim(user_text: str):
-    """
-    End-to-end health misinformation check.
-    Steps:
-    1. Decompose input into atomic claims
-    2. Retrieve similar misinformation narratives
-    3. Retrieve verified medical facts
-    4. Use LLM ONLY to explain retrieved evidence
-    """
+# Restrict searches to narratives/facts matching the claim's detected
+# language and domain (falls back to unfiltered search on weak results)
+FILTERED_SEARCH = True
 
-    atomic_claims = extract_atomic_claims(user_text)
+# Deterministic fast path: skip the LLM when retrieval is conclusive, i.e.
+# the claim closely matches a narrative already marked false AND a verified
+# fact is close enough to cite. Thresholds are cosine scores, so the fast
+# path only applies to "single" retrieval (fused hybrid scores are ranks).
+# Paraphrase embeddings barely register negation ("vaccines do not cause
+# autism" scores high against "vaccines cause autism"), so the narrative
+# match must be near-exact and agree in polarity with the claim.
+FAST_PATH = True
+FAST_PATH_MISINFO_SCORE = 0.97
+FAST_PATH_FACT_SCORE = 0.6
 
-    if not atomic_claims:
-        return [{
-            "verdict": "UNVERIFIED",
-            "explanation": "No clear health-related factual claim detected.",
-            "sources": []
-        }]
+NEGATION_WORDS = {
+    "not", "no", "never", "neither", "nor", "cannot", "none", "nothing",
+    "नहीं", "न", "ना", "मत",
+}
 
-    results = []
+# ============================================================
+# Prompt
+# ============================================================
 
-    for claim in atomic_claims:
-        claim_vector = embedding_model.encode(claim).tolist()
-
-        # -----------------------------
-        # Retrieve misinformation narratives
-        # -----------------------------
-        misinfo_results = client.query_points(
-            collection_name=MISINFO_COLLECTION,
-            query=claim_vector,
-            using=MISINFO_VECTOR_NAME,
-            limit=2
-        ).points
-
-        # -----------------------------
-        # Retrieve verified medical facts
-        # -----------------------------
-        fact_results = client.query_points(
-            collection_name=FACT_COLLECTION,
-            query=claim_vector,
-            using=FACT_VECTOR_NAME,
-            limit=2
-        ).points
-
-        # -----------------------------
-        # Build fact context (STRICT)
-        # -----------------------------
-        if fact_results:
-            fact_context = "\n".join(
-                f"- {f.payload['fact_text']} (Source: {f.payload['source']})"
-                for f in fact_results
-            )
-        else:
-            fact_context = "No verified medical sources found."
+def build_prompt(claim: str, fact_results) -> str:
+    # -----------------------------
+    # Build fact context (STRICT)
+    # -----------------------------
+    if fact_results:
+        fact_context = "\n".join(
+            f"- {f.payload['fact_text']} (Source: {f.payload['source']})"
+            for f in fact_results
+        )
+    else:
+        fact_context = "No verified medical sources found."
 
-        # -----------------------------
-        # LLM prompt (explanation-only)
-        # -----------------------------
-        prompt = f"""
+    # -----------------------------
+    # LLM prompt (explanation-only)
+    # -----------------------------
+    return f"""
 You are a health misinformation assistant.
 
 User claim:
@@ -108,15 +86,747 @@ Explanation:
 Sources:
 """
 
-        llm_response = ollama.chat(
-            model="mistral",
-            messages=[{"role": "user", "content": prompt}]
+# ============================================================
+# Fast path (no LLM)
+# ============================================================
+
+def is_negated(text: str) -> bool:
+    """
+    True when the text contains a negation word (or an "n't" contraction).
+    """
+    for token in text.lower().replace("’", "'").split():
+        token = token.strip(".,;:!?।\"'()")
+        if token in NEGATION_WORDS or token.endswith("n't"):
+            return True
+    return False
+
+
+def fast_path_response(claim: str, claim_evidence):
+    """
+    Templated FALSE verdict with cited sources taken straight from the
+    payloads, or None when the evidence is not conclusive.
+    """
+    if not FAST_PATH or RETRIEVAL_MODE != "single":
+        return None
+
+    misinfo = claim_evidence["misinfo"]
+    if not misinfo or misinfo[0].score < FAST_PATH_MISINFO_SCORE:
+        return None
+    if str(misinfo[0].payload.get("verdict", "")).lower() != "false":
+        return None
+
+    # A debunk of the narrative is not the narrative: let the LLM decide
+    narrative = misinfo[0].payload.get("claim_text")
+    if narrative is None or is_negated(claim) != is_negated(narrative):
+        return None
+
+    facts = [f for f in claim_evidence["facts"] if f.score >= FAST_PATH_FACT_SCORE]
+    if not facts:
+        return None
+
+    fact_lines = "\n".join(f"- {f.payload['fact_text']}" for f in facts)
+    source_lines = "\n".join(
+        f"- {f.payload['source']}"
+        + (f" ({f.payload['source_url']})" if f.payload.get("source_url") else "")
+        for f in facts
+    )
+
+    return f"""Verdict: FALSE
+Explanation: This claim matches a known health misinformation narrative ("{misinfo[0].payload.get('claim_text', claim)}"). Verified medical sources say:
+{fact_lines}
+Sources:
+{source_lines}"""
+
+# ============================================================
+# Core pipeline
+# ============================================================
+
+async def _explain_claim(
+    engine: VerifactsEngine,
+    claim: str,
+    fact_results,
+    semaphore: asyncio.Semaphore,
+    on_token=None,
+    trace=None
+):
+    """
+    LLM explanation for one claim. With `on_token`, the response is
+    streamed and each token is passed to it as it arrives.
+    """
+    prompt = build_prompt(claim, fact_results)
+    messages = [{"role": "user", "content": prompt}]
+
+    async with semaphore:
+        with engine.metrics.timer("llm", trace):
+            if on_token is None:
+                llm_response = await engine.llm_client.chat(model=LLM_MODEL, messages=messages)
+                content = llm_response["message"]["content"]
+            else:
+                parts = []
+                chunk = {}  # an empty stream has no final chunk
+                async for chunk in await engine.llm_client.chat(
+                    model=LLM_MODEL, messages=messages, stream=True
+                ):
+                    token = chunk["message"]["content"]
+                    if token:
+                        parts.append(token)
+                        on_token(token)
+                # The final chunk carries the token counts
+                llm_response = chunk
+                content = "".join(parts)
+
+    engine.metrics.record_tokens(
+        llm_response.get("prompt_eval_count"), llm_response.get("eval_count"), trace
+    )
+
+    return {
+        "claim": claim,
+        "response": content
+    }
+
+
+async def _local_indexes(engine: VerifactsEngine):
+    """
+    The engine's in-process indexes that are loaded and small enough to
+    use, (re)loading any that are stale or predate the fact-base version.
+    """
+    ready = {}
+    for collection, index in engine.local_indexes.items():
+        # Hybrid misinfo search fuses two named vectors in Qdrant
+        if collection == MISINFO_COLLECTION and RETRIEVAL_MODE != "single":
+            continue
+        if await index.ensure_fresh(engine.async_client, engine.fact_base_version):
+            ready[collection] = index
+    return ready
+
+
+async def _claim_events(
+    engine: VerifactsEngine,
+    atomic_claims,
+    max_concurrency: int,
+    stream_tokens: bool,
+    semaphore: asyncio.Semaphore = None,
+    trace=None
+):
+    """
+    Steps 2-4 of the pipeline for already decomposed claims, as events
+    (see stream_health_claim_async()). Every stage is batched across
+    `atomic_claims`, whichever request(s) they came from.
+
+    `semaphore` bounds the LLM calls; pass a shared one to bound several
+    concurrent calls together (defaults to a fresh `max_concurrency` one).
+    Stage timings go to engine.metrics (and `trace`, when given).
+
+    A claim whose LLM call fails yields an "error" event (with the
+    exception) in place of its result; the other claims still finish. A
+    claim already being explained for a concurrent request waits for that
+    call instead of making its own (path "inflight").
+    """
+    metrics = engine.metrics
+    verdict_cache = engine.verdict_cache
+
+    results = [None] * len(atomic_claims)
+    paths = [None] * len(atomic_claims)
+    emitted = 0
+
+    def ready():
+        # Result (or error) events for the answered prefix of the claim list
+        nonlocal emitted
+        while emitted < len(results) and results[emitted] is not None:
+            yield {
+                "event": "error" if "error" in results[emitted] else "result",
+                "index": emitted,
+                "path": paths[emitted],
+                **results[emitted]
+            }
+            emitted += 1
+
+    # Repeat claims are answered straight from the verdict cache
+    cache_keys = [claim_cache_key(c, engine.fact_base_version) for c in atomic_claims]
+    for i, key in enumerate(cache_keys):
+        results[i] = verdict_cache.get(key)
+        if results[i] is not None:
+            paths[i] = "verdict_cache"
+
+    pending = [i for i, cached in enumerate(results) if cached is None]
+    engine.path_counter.record("verdict_cache", len(atomic_claims) - len(pending))
+
+    for event in ready():
+        yield event
+    if not pending:
+        return
+
+    pending_claims = [atomic_claims[i] for i in pending]
+
+    # Embed every uncached claim in one batched forward pass
+    with metrics.timer("embed", trace):
+        claim_vectors = await asyncio.to_thread(
+            engine.embed, pending_claims, EMBED_BATCH_SIZE
+        )
+
+    # Paraphrases of recently answered claims reuse that explanation
+    # (same polarity only: "X is not Y" embeds close to "X is Y")
+    negated = [is_negated(claim) for claim in pending_claims]
+    matches = engine.semantic_cache.lookup_many(
+        claim_vectors, engine.fact_base_version, negated
+    )
+
+    unanswered = []
+    for row, (i, match) in enumerate(zip(pending, matches)):
+        if match is None:
+            unanswered.append(row)
+            continue
+
+        result = {"claim": atomic_claims[i], "response": match[0]["response"]}
+        verdict_cache.set(cache_keys[i], result)
+        results[i] = result
+        paths[i] = "semantic_cache"
+
+    engine.path_counter.record("semantic_cache", len(pending) - len(unanswered))
+
+    for event in ready():
+        yield event
+    if not unanswered:
+        return
+
+    claim_vectors = claim_vectors[unanswered]
+    pending = [pending[row] for row in unanswered]
+    pending_claims = [pending_claims[row] for row in unanswered]
+
+    medical_vectors = None
+    if RETRIEVAL_MODE == "hybrid":
+        with metrics.timer("embed", trace):
+            medical_vectors = await asyncio.to_thread(engine.embed_medical, pending_claims)
+
+    # Retrieve misinformation narratives + verified facts for all claims
+    # (one batched request per collection, both in flight together; small
+    # collections are searched in-process instead)
+    evidence = await retrieve_evidence_async(
+        engine.async_client,
+        claim_vectors,
+        mode=RETRIEVAL_MODE,
+        medical_vectors=medical_vectors,
+        filters=[claim_filters(c) for c in pending_claims] if FILTERED_SEARCH else None,
+        timer=lambda stage: metrics.timer(stage, trace),
+        local_indexes=await _local_indexes(engine)
+    )
+
+    for i, claim, claim_evidence in zip(pending, pending_claims, evidence):
+        yield {"event": "evidence", "index": i, "claim": claim, "evidence": claim_evidence}
+
+    # Conclusive retrieval is answered from the payloads; only ambiguous
+    # claims go to the LLM
+    explained = [None] * len(pending)
+    needs_llm = []
+    for row, (claim, claim_evidence) in enumerate(zip(pending_claims, evidence)):
+        response = fast_path_response(claim, claim_evidence)
+        if response is None:
+            needs_llm.append(row)
+        else:
+            explained[row] = {"claim": claim, "response": response}
+            verdict_cache.set(cache_keys[pending[row]], explained[row])
+            results[pending[row]] = explained[row]
+            paths[pending[row]] = "fast_path"
+
+    engine.path_counter.record("fast_path", len(pending) - len(needs_llm))
+
+    for event in ready():
+        yield event
+
+    # Every LLM call starts now; each one feeds its own queue with
+    # ("token", str, None) items and a final ("result", dict, path) or
+    # ("error", exc, path)
+    semaphore = semaphore or asyncio.Semaphore(max_concurrency)
+    queues = {row: asyncio.Queue() for row in needs_llm}
+    inflight = engine.inflight_claims
+
+    async def lead(row, key):
+        # Our own LLM call, shared with identical claims of concurrent requests
+        queue = queues[row]
+        shared = asyncio.get_running_loop().create_future()
+        shared.add_done_callback(lambda f: f.cancelled() or f.exception())
+        inflight[key] = shared
+
+        try:
+            result = await _explain_claim(
+                engine,
+                pending_claims[row],
+                evidence[row]["facts"],
+                semaphore,
+                on_token=(lambda token: queue.put_nowait(("token", token, None)))
+                if stream_tokens else None,
+                trace=trace
+            )
+        except Exception as exc:
+            shared.set_exception(exc)
+            raise
+        except BaseException:
+            shared.cancel()
+            raise
+        else:
+            shared.set_result(result)
+            return result
+        finally:
+            if inflight.get(key) is shared:
+                del inflight[key]
+
+    async def explain(row):
+        queue = queues[row]
+        claim = pending_claims[row]
+        key = cache_keys[pending[row]]
+        path = "llm"
+
+        try:
+            shared = inflight.get(key)
+            if shared is not None:
+                try:
+                    result = await asyncio.shield(shared)
+                except asyncio.CancelledError:
+                    if not shared.cancelled():
+                        raise
+                    shared = None  # its request went away: answer it ourselves
+                else:
+                    path = "inflight"
+
+            if shared is None:
+                # Answered by a concurrent request since our cache lookup?
+                result = verdict_cache.get(key)
+                if result is not None:
+                    path = "verdict_cache"
+                else:
+                    result = await lead(row, key)
+        except Exception as exc:
+            queue.put_nowait(("error", exc, path))
+        else:
+            queue.put_nowait(("result", {"claim": claim, "response": result["response"]}, path))
+
+    tasks = [asyncio.create_task(explain(row)) for row in needs_llm]
+
+    try:
+        for row in needs_llm:
+            i = pending[row]
+
+            while True:
+                kind, item, path = await queues[row].get()
+
+                if kind == "token":
+                    yield {"event": "token", "index": i, "content": item}
+                    continue
+
+                # A failed claim fails alone; the other claims still finish
+                paths[i] = path
+                engine.path_counter.record(paths[i])
+                if kind == "error":
+                    results[i] = {"claim": pending_claims[row], "error": item}
+                    break
+
+                explained[row] = item
+                results[i] = item
+                verdict_cache.set(cache_keys[i], item)
+                break
+
+            for event in ready():
+                yield event
+    finally:
+        for task in tasks:
+            task.cancel()
+
+    answered = [row for row, item in enumerate(explained) if item is not None]
+    engine.semantic_cache.add_many(
+        claim_vectors[answered], [explained[row] for row in answered],
+        engine.fact_base_version, [negated[row] for row in answered]
+    )
+
+
+async def stream_health_claim_async(
+    user_text: str,
+    max_concurrency: int = LLM_CONCURRENCY,
+    engine: VerifactsEngine = None,
+    stream_tokens: bool = True
+):
+    """
+    End-to-end health misinformation check, as an async stream of events.
+    Steps:
+    1. Decompose input into atomic claims
+    2. Retrieve similar misinformation narratives
+    3. Retrieve verified medical facts
+    4. Use LLM ONLY to explain retrieved evidence
+
+    Events (dicts, "event" says which):
+    - {"event": "claims", "claims": [...]}                  once, after step 1
+    - {"event": "evidence", "index", "claim", "evidence"}   per retrieved claim
+    - {"event": "token", "index", "content"}                per LLM token
+    - {"event": "result", "index", "claim", "response", "path"}  per claim
+
+    A failed LLM call raises (after the results of the claims before it).
+
+    Token and result events come in claim order, so a consumer can print
+    them as they arrive; the LLM calls themselves still run concurrently
+    (at most `max_concurrency` at a time) and later claims are buffered.
+    `path` is how the claim was answered (see pipeline_metrics.CLAIM_PATHS).
+
+    `engine` defaults to the process-wide engine (see get_engine()).
+    """
+    engine = engine or get_engine()
+    trace = engine.metrics.new_trace()
+
+    # spaCy and the encoder are CPU-bound (and load lazily on first use):
+    # keep them off the event loop
+    with engine.metrics.timer("decompose", trace):
+        atomic_claims = await asyncio.to_thread(
+            lambda: extract_atomic_claims(user_text, engine.nlp)
         )
 
-        results.append({
-            "claim": claim,
-            "response": llm_response["message"]["content"]
-        })
+    yield {"event": "claims", "claims": atomic_claims}
+
+    paths = []
+    if atomic_claims:
+        async for event in _claim_events(
+            engine, atomic_claims, max_concurrency, stream_tokens, trace=trace
+        ):
+            if event["event"] == "error":
+                raise event["error"]
+            if event["event"] == "result":
+                paths.append(event["path"])
+            yield event
+
+    engine.metrics.record_requests([len(atomic_claims)], trace, [paths])
+
+
+def no_claim_result():
+    """
+    Result list for an input without any checkable claim.
+    """
+    return [{
+        "verdict": "UNVERIFIED",
+        "explanation": "No clear health-related factual claim detected.",
+        "sources": []
+    }]
+
+
+async def check_health_claim_async(
+    user_text: str,
+    max_concurrency: int = LLM_CONCURRENCY,
+    engine: VerifactsEngine = None
+):
+    """
+    All claim results at once: [{"claim", "response"}, ...] in claim order.
+    See stream_health_claim_async() for the steps.
+    """
+    results = []
+
+    async for event in stream_health_claim_async(
+        user_text, max_concurrency, engine, stream_tokens=False
+    ):
+        if event["event"] == "result":
+            results.append({"claim": event["claim"], "response": event["response"]})
+
+    return results or no_claim_result()
+
+
+async def answer_claims_async(
+    atomic_claims,
+    max_concurrency: int = LLM_CONCURRENCY,
+    engine: VerifactsEngine = None,
+    semaphore: asyncio.Semaphore = None,
+    trace=None,
+    return_exceptions: bool = False,
+    paths: list = None
+):
+    """
+    Steps 2-4 for already decomposed claims, batched across all of them.
+    Returns [{"claim", "response"}, ...] in input order.
+
+    A failed claim raises its exception, or with `return_exceptions`, the
+    exception takes that claim's place in the list (like asyncio.gather).
+    When given, `paths` is extended with each claim's answer path.
+    """
+    engine = engine or get_engine()
+    results = []
+
+    if atomic_claims:
+        async for event in _claim_events(
+            engine, atomic_claims, max_concurrency, stream_tokens=False,
+            semaphore=semaphore, trace=trace
+        ):
+            if paths is not None and event["event"] in ("result", "error"):
+                paths.append(event["path"])
+            if event["event"] == "result":
+                results.append({"claim": event["claim"], "response": event["response"]})
+            elif event["event"] == "error":
+                if not return_exceptions:
+                    raise event["error"]
+                results.append(event["error"])
 
     return results
-# ============================================================
\ No newline at end of file
+
+
+async def check_health_claims_batch_async(
+    user_texts,
+    max_concurrency: int = LLM_CONCURRENCY,
+    engine: VerifactsEngine = None,
+    return_exceptions: bool = False
+):
+    """
+    check_health_claim_async() for many inputs at once: one spaCy pass
+    (nlp.pipe), then one embedding call and one Qdrant request per
+    collection for the distinct claims of all inputs together.
+
+    Returns one result list per input, in input order. A failed claim
+    raises, or with `return_exceptions`, fails only the inputs containing
+    it: their place in the list holds the exception.
+    """
+    engine = engine or get_engine()
+    user_texts = list(user_texts)
+    trace = engine.metrics.new_trace()
+
+    with engine.metrics.timer("decompose", trace):
+        claims_per_text = await asyncio.to_thread(
+            lambda: extract_atomic_claims_batch(user_texts, nlp=engine.nlp)
+        )
+
+    # Inputs often repeat the same viral claim: answer each distinct one once
+    unique_claims = list(dict.fromkeys(c for claims in claims_per_text for c in claims))
+    paths = []
+    answers = dict(zip(
+        unique_claims,
+        await answer_claims_async(
+            unique_claims, max_concurrency, engine, trace=trace,
+            return_exceptions=True, paths=paths
+        )
+    ))
+    path_of = dict(zip(unique_claims, paths))
+
+    engine.metrics.record_requests(
+        [len(claims) for claims in claims_per_text], trace,
+        [[path_of[c] for c in claims] for claims in claims_per_text]
+    )
+
+    outputs = []
+    for claims in claims_per_text:
+        results = [answers[c] for c in claims]
+        error = next((r for r in results if isinstance(r, Exception)), None)
+
+        if error is None:
+            outputs.append(results or no_claim_result())
+        elif return_exceptions:
+            outputs.append(error)
+        else:
+            raise error
+
+    return outputs
+
+# ============================================================
+# Sync entry point
+# ============================================================
+
+# The async clients keep connection pools bound to the event loop that
+# first used them, so sync callers share one long-lived background loop
+# instead of spinning up a fresh loop per call with asyncio.run().
+_loop = None
+_loop_lock = threading.Lock()
+
+
+def background_loop():
+    """
+    The shared event loop (started on first use) running the async pipeline.
+    """
+    global _loop
+
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(
+                target=_loop.run_forever,
+                name="verifacts-async",
+                daemon=True
+            ).start()
+
+    return _loop
+
+
+def _run_sync(coro):
+    return asyncio.run_coroutine_threadsafe(coro, background_loop()).result()
+
+
+def check_health_claim(user_text: str, engine: VerifactsEngine = None):
+    """
+    Blocking wrapper around check_health_claim_async().
+    """
+    return _run_sync(check_health_claim_async(user_text, engine=engine))
+
+
+def stream_health_claim(user_text: str, engine: VerifactsEngine = None):
+    """
+    Blocking generator over stream_health_claim_async() events, yielded as
+    soon as the background loop produces them.
+    """
+    events = queue.Queue()
+    done = object()
+
+    async def pump():
+        try:
+            async for event in stream_health_claim_async(user_text, engine=engine):
+                events.put(event)
+        finally:
+            events.put(done)
+
+    future = asyncio.run_coroutine_threadsafe(pump(), background_loop())
+
+    try:
+        while True:
+            event = events.get()
+            if event is done:
+                break
+            yield event
+
+        future.result()  # re-raise pipeline errors
+    finally:
+        future.cancel()
+
+# ============================================================
+# Validation (stub LLM + encoder, in-memory Qdrant, no models needed)
+# ============================================================
+
+if __name__ == "__main__":
+    import numpy as np
+    import spacy
+    from qdrant_client import AsyncQdrantClient
+    from qdrant_client.models import Distance, PointStruct, VectorParams
+
+    from evidence_retrieval import FACT_COLLECTION, FACT_VECTOR_NAME, MISINFO_VECTOR_NAME
+
+    # Hindi claims take the sentence fallback, so no spaCy model is loaded
+    TEXT = (
+        "पोलियो की दवा बच्चों के लिए खतरनाक है।\n"
+        "हल्दी से कैंसर ठीक होता है।\n"
+        "नीम से मधुमेह ठीक होता है।\n"
+        "गिलोय से डेंगू ठीक होता है।\n"
+        "इसे सबको शेयर करें!"
+    )
+    # One basis vector per subject: paraphrases share a vector
+    SUBJECTS = ["पोलियो", "हल्दी", "नीम", "गिलोय"]
+
+    class StubEncoder:
+        def get_sentence_embedding_dimension(self):
+            return len(SUBJECTS)
+
+        def encode(self, texts, **kwargs):
+            return np.array(
+                [[float(subject in text) for subject in SUBJECTS] for text in texts],
+                dtype=np.float32
+            )
+
+    class StubLLM:
+        """
+        ollama.AsyncClient stand-in: later claims answer faster, so
+        ordering is really exercised; tracks concurrent calls.
+        """
+
+        def __init__(self):
+            self.calls = 0
+            self.inflight = 0
+            self.peak = 0
+
+        async def chat(self, model, messages, stream=False, **kwargs):
+            claim = messages[0]["content"].split('"')[1]
+            delay = 0.05 * (len(SUBJECTS) - next(
+                (i for i, subject in enumerate(SUBJECTS) if subject in claim), 0
+            ))
+
+            self.calls += 1
+            self.inflight += 1
+            self.peak = max(self.peak, self.inflight)
+            try:
+                await asyncio.sleep(delay)
+            finally:
+                self.inflight -= 1
+
+            response = {"message": {"content": f"Verdict: FALSE ({claim})"}, "eval_count": 3}
+            if not stream:
+                return response
+
+            async def chunks():
+                yield {"message": {"content": "Verdict: "}}
+                yield {"message": {"content": f"FALSE ({claim})"}, "eval_count": 3}
+
+            return chunks()
+
+    async def seeded_client():
+        client = AsyncQdrantClient(":memory:")
+        size = len(SUBJECTS)
+
+        await client.create_collection(
+            MISINFO_COLLECTION,
+            vectors_config={MISINFO_VECTOR_NAME: VectorParams(size=size, distance=Distance.COSINE)}
+        )
+        await client.create_collection(
+            FACT_COLLECTION,
+            vectors_config={FACT_VECTOR_NAME: VectorParams(size=size, distance=Distance.COSINE)}
+        )
+        await client.upsert(MISINFO_COLLECTION, [
+            PointStruct(id=1, vector={MISINFO_VECTOR_NAME: [1, 0, 0, 0]},
+                        payload={"claim_text": "पोलियो की दवा बच्चों के लिए खतरनाक है",
+                                 "verdict": "false", "language": "hi", "domain": "vaccination"}),
+        ])
+        await client.upsert(FACT_COLLECTION, [
+            PointStruct(id=1, vector={FACT_VECTOR_NAME: [1, 0, 0, 0]},
+                        payload={"fact_text": "पोलियो की दवा सुरक्षित है।", "source": "WHO",
+                                 "domain": "vaccination"}),
+        ])
+        return client
+
+    def stub_engine(llm):
+        return VerifactsEngine(
+            nlp=spacy.blank("en"),
+            embedding_model=StubEncoder(),
+            async_client=_run_sync(seeded_client()),
+            llm_client=llm,
+        )
+
+    def result_paths(events):
+        return [e["path"] for e in events if e["event"] == "result"]
+
+    print("\n=== PIPELINE VALIDATION ===\n")
+
+    checks = []
+
+    # Streaming: tokens and results in claim order, although later
+    # claims' LLM calls finish first
+    llm = StubLLM()
+    engine = stub_engine(llm)
+    events = list(stream_health_claim(TEXT, engine=engine))
+    claims = events[0]["claims"]
+    results = [e for e in events if e["event"] == "result"]
+    order = [e["index"] for e in events if e["event"] in ("token", "result")]
+
+    checks.append(("noise sentence dropped, 4 claims", len(claims) == 4))
+    checks.append(("results in claim order", [e["claim"] for e in results] == claims))
+    checks.append(("token/result events in claim order", order == sorted(order)))
+    checks.append(("known narrative takes the fast path",
+                   result_paths(events) == ["fast_path", "llm", "llm", "llm"]))
+    checks.append(("LLM only for the other claims", llm.calls == 3))
+
+    # Repeats and paraphrases never reach the LLM
+    repeat = list(stream_health_claim(TEXT, engine=engine))
+    checks.append(("repeat served from the verdict cache",
+                   result_paths(repeat) == ["verdict_cache"] * 4))
+
+    paraphrase = list(stream_health_claim("हल्दी से कैंसर पूरी तरह ठीक होता है।", engine=engine))
+    checks.append(("paraphrase served from the semantic cache",
+                   result_paths(paraphrase) == ["semantic_cache"] and llm.calls == 3))
+
+    # The narrative's answer is cached by now, but a debunk of it is not a paraphrase
+    debunk = list(stream_health_claim("पोलियो की दवा खतरनाक नहीं है।", engine=engine))
+    checks.append(("negated claim skips the semantic cache and fast path",
+                   result_paths(debunk) == ["llm"] and llm.calls == 4))
+
+    # Concurrency: the LLM calls overlap, bounded by max_concurrency
+    llm = StubLLM()
+    answers = _run_sync(check_health_claim_async(TEXT, max_concurrency=2, engine=stub_engine(llm)))
+    checks.append(("non-streaming results in claim order",
+                   [a["claim"] for a in answers] == claims))
+    checks.append(("at most max_concurrency LLM calls at once", llm.peak == 2))
+
+    for i, (name, ok) in enumerate(checks, start=1):
+        print(f"Check {i}: {name}: {'✅ PASS' if ok else '❌ FAIL'}")
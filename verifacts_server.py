@@ -0,0 +1,282 @@
+import argparse
+import asyncio
+import json
+import logging
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from verifacts_engine import get_engine
+from verifacts_pipeline import background_loop, check_health_claims_batch_async
+
+# ============================================================
+# Config
+# ============================================================
+
+HOST = "127.0.0.1"
+PORT = 8000
+
+# Requests arriving within BATCH_WINDOW_MS of the first one in a batch are
+# decomposed, embedded and searched together
+BATCH_WINDOW_MS = 10
+MAX_BATCH_REQUESTS = 32
+
+# Batches being answered at once (each runs its own LLM calls)
+MAX_INFLIGHT_BATCHES = 4
+
+# Backpressure: requests waiting for a batch beyond this are rejected (503)
+MAX_QUEUE_DEPTH = 256
+
+# Per-request deadline, queueing included (504 when exceeded)
+REQUEST_TIMEOUT_SECONDS = 60
+
+MAX_BODY_BYTES = 64 * 1024
+
+# ============================================================
+# Micro-batching scheduler
+# ============================================================
+
+class Overloaded(Exception):
+    """
+    The scheduler queue is full; the caller should retry later.
+    """
+
+
+class MicroBatcher:
+    """
+    Coalesces concurrent requests into batches for `handler`, an async
+    function mapping a list of inputs to a list of outputs (same order).
+    An output that is an exception fails only its own caller.
+
+    Runs on one event loop: submit() must be awaited on that loop.
+    """
+
+    def __init__(
+        self,
+        handler,
+        window_ms: float = BATCH_WINDOW_MS,
+        max_batch: int = MAX_BATCH_REQUESTS,
+        max_queue_depth: int = MAX_QUEUE_DEPTH,
+        max_inflight: int = MAX_INFLIGHT_BATCHES,
+    ):
+        self.handler = handler
+        self.window = window_ms / 1000
+        self.max_batch = max_batch
+        self.max_queue_depth = max_queue_depth
+        self.max_inflight = max_inflight
+
+        self._queue = None
+        self._worker = None
+        self._inflight = None
+
+    def queue_depth(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    async def submit(self, item):
+        if self._worker is None:
+            self._queue = asyncio.Queue(maxsize=self.max_queue_depth)
+            self._inflight = asyncio.Semaphore(self.max_inflight)
+            self._worker = asyncio.create_task(self._collect())
+
+        future = asyncio.get_running_loop().create_future()
+        try:
+            self._queue.put_nowait((item, future))
+        except asyncio.QueueFull:
+            raise Overloaded(f"{self.max_queue_depth} requests already queued")
+
+        return await future
+
+    async def _collect(self):
+        loop = asyncio.get_running_loop()
+
+        while True:
+            # Wait for a free batch slot first, so a saturated service keeps
+            # requests in the (bounded) queue instead of piling up batches
+            await self._inflight.acquire()
+
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.window
+
+            while len(batch) < self.max_batch:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+
+            asyncio.create_task(self._answer(batch))
+
+    async def _answer(self, batch):
+        try:
+            # Callers that already timed out are dropped from the batch
+            batch = [(item, future) for item, future in batch if not future.done()]
+            if not batch:
+                return
+
+            try:
+                outputs = await self.handler([item for item, _ in batch])
+            except Exception as exc:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(exc)
+                return
+
+            for (_, future), output in zip(batch, outputs):
+                if future.done():
+                    continue
+                if isinstance(output, Exception):
+                    future.set_exception(output)
+                else:
+                    future.set_result(output)
+        finally:
+            self._inflight.release()
+
+# ============================================================
+# HTTP API
+#   POST /check   {"text": "..."}  ->  {"results": [...]}
+#   GET  /health
+#   GET  /metrics  (Prometheus text format)
+# ============================================================
+
+async def _check_batch(texts):
+    # A failing claim only fails the requests that contain it
+    return await check_health_claims_batch_async(texts, return_exceptions=True)
+
+
+batcher = MicroBatcher(_check_batch)
+
+
+async def _check(text: str, timeout: float):
+    return await asyncio.wait_for(batcher.submit(text), timeout)
+
+
+def metrics_text() -> str:
+    engine = get_engine()
+    return engine.metrics.prometheus_text(engine.path_counter.counts()) + (
+        "# HELP verifacts_queue_depth Requests waiting for a batch.\n"
+        "# TYPE verifacts_queue_depth gauge\n"
+        f"verifacts_queue_depth {batcher.queue_depth()}\n"
+    )
+
+
+class VerifactsHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def _send(self, status: int, payload: bytes, content_type: str):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(payload)))
+        if status == 503:
+            self.send_header("Retry-After", "1")
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _send_json(self, status: int, body):
+        payload = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        self._send(status, payload, "application/json; charset=utf-8")
+
+    def do_GET(self):
+        if self.path == "/health":
+            self._send_json(200, {"status": "ok", "queue_depth": batcher.queue_depth()})
+        elif self.path == "/metrics":
+            self._send(200, metrics_text().encode("utf-8"), "text/plain; version=0.0.4")
+        else:
+            self._send_json(404, {"error": "not found"})
+
+    def do_POST(self):
+        if self.path != "/check":
+            self._send_json(404, {"error": "not found"})
+            return
+
+        length = int(self.headers.get("Content-Length") or 0)
+        if length > MAX_BODY_BYTES:
+            self._send_json(413, {"error": f"body larger than {MAX_BODY_BYTES} bytes"})
+            return
+
+        try:
+            text = json.loads(self.rfile.read(length) or b"{}").get("text")
+        except (ValueError, AttributeError):
+            text = None
+
+        if not isinstance(text, str) or not text.strip():
+            self._send_json(400, {"error": 'expected a JSON body like {"text": "..."}'})
+            return
+
+        future = asyncio.run_coroutine_threadsafe(
+            _check(text, self.server.request_timeout), background_loop()
+        )
+
+        try:
+            results = future.result()
+        except Overloaded as exc:
+            self._send_json(503, {"error": f"server busy: {exc}"})
+        except asyncio.TimeoutError:
+            self._send_json(504, {"error": "timed out"})
+        except Exception as exc:
+            self._send_json(500, {"error": str(exc)})
+        else:
+            self._send_json(200, {"results": results})
+
+
+class VerifactsServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # listen() backlog: the default (5) resets connections under bursts
+    # long before the scheduler queue is full
+    request_queue_size = MAX_QUEUE_DEPTH
+
+
+def build_server(
+    host: str = HOST,
+    port: int = PORT,
+    request_timeout: float = REQUEST_TIMEOUT_SECONDS,
+):
+    server = VerifactsServer((host, port), VerifactsHandler)
+    server.request_timeout = request_timeout
+    return server
+
+# ============================================================
+# CLI
+# ============================================================
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Serve VeriFacts over HTTP.")
+    parser.add_argument("--host", default=HOST)
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--window-ms", type=float, default=BATCH_WINDOW_MS,
+                        help="how long a batch waits for more requests")
+    parser.add_argument("--max-batch", type=int, default=MAX_BATCH_REQUESTS)
+    parser.add_argument("--max-inflight", type=int, default=MAX_INFLIGHT_BATCHES)
+    parser.add_argument("--max-queue", type=int, default=MAX_QUEUE_DEPTH,
+                        help="queued requests beyond this get 503")
+    parser.add_argument("--timeout", type=float, default=REQUEST_TIMEOUT_SECONDS,
+                        help="per-request deadline in seconds (504 when exceeded)")
+    parser.add_argument("--request-log", action="store_true",
+                        help="log one JSON line per request (claim paths; batch stage timings, tokens)")
+    parser.add_argument("--no-metrics", action="store_true",
+                        help="disable latency/token instrumentation")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+
+    batcher.window = args.window_ms / 1000
+    batcher.max_batch = args.max_batch
+    batcher.max_inflight = args.max_inflight
+    batcher.max_queue_depth = args.max_queue
+
+    metrics = get_engine().metrics
+    metrics.enabled = not args.no_metrics
+    metrics.request_log = args.request_log
+    if args.request_log:
+        logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    server = build_server(args.host, args.port, args.timeout)
+    print(f"VeriFacts API on http://{args.host}:{args.port} "
+          f"(POST /check, GET /health, GET /metrics)")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nShutting down.")
+        server.server_close()